@@ -10,6 +10,7 @@ sys.path.insert(0, str(src_path))
 
 # Now import from src folder
 from src.combinedPipeline import SummarizationPipeline
+from metrics import REMOTE_SERVICES, latency_summary
 
 # Load environment variables from src folder
 env_path = src_path / ".env"
@@ -181,8 +182,9 @@ with st.sidebar:
     
     method = st.radio(
         "📊 Summarization Method",
-        ["Extractive", "Abstractive"],
-        help="Extractive: Selects key sentences from original text\nAbstractive: Generates new summary using AI"
+        ["Extractive", "Abstractive", "Hybrid"],
+        help="Extractive: Selects key sentences from original text\nAbstractive: Generates new summary using AI\n"
+             "Hybrid: Keeps the key sentences, then summarizes only those with AI (faster on long documents)"
     )
     
     length = st.select_slider(
@@ -202,11 +204,21 @@ with st.sidebar:
     st.markdown("---")
     
     st.markdown("### 📈 Quick Stats")
+    # API and on-host latency are kept apart: local calls take milliseconds and would hide API latency
+    api_latency = latency_summary(service=REMOTE_SERVICES, outcome="success")
+    local_latency = latency_summary(service="local", outcome="success")
     col_s1, col_s2 = st.columns(2)
     with col_s1:
         st.metric("Models", "2+", delta="Active")
     with col_s2:
-        st.metric("Speed", "Fast", delta="Cloud")
+        if api_latency["count"]:
+            st.metric("API p50", f"{api_latency['p50']:.2f}s", delta=f"p95 {api_latency['p95']:.2f}s",
+                      delta_color="off", help=f"Successful API calls in this process: {api_latency['count']}")
+        else:
+            st.metric("API p50", "—", help="No API calls yet")
+    if local_latency["count"]:
+        st.caption(f"Local engine: p50 {local_latency['p50'] * 1000:.0f} ms · "
+                   f"p95 {local_latency['p95'] * 1000:.0f} ms ({local_latency['count']} calls)")
     
     st.markdown("---")
     
@@ -272,13 +284,47 @@ with tab1:
         if summarize_btn and input_text:
             with st.spinner("🔄 Processing with AI..."):
                 try:
-                    summary = pipeline.summarize(input_text, method=method.lower(), length=length.lower())
+                    progress = st.empty()
+                    result = None
+                    final_error = None
+                    if method in ("Abstractive", "Hybrid") and pipeline.progressive:
+                        # Show an instant local draft, then replace it in place when the AI summary lands
+                        progressive = pipeline.summarize_progressive(input_text, method=method.lower(), length=length.lower())
+                        draft = progressive.draft["summary"]
+                        if not (draft.startswith("❌") or draft.startswith("⚠️")):
+                            with progress.container():
+                                st.caption("📝 Quick draft (extractive) — refining with AI...")
+                                st.markdown(draft)
+                        result = progressive.result()
+                        if result["summary"].startswith(("❌", "⚠️")) and progressive.current is progressive.draft \
+                                and not draft.startswith(("❌", "⚠️")):
+                            # Keep the draft on screen rather than replacing it with the error
+                            final_error = result["summary"]
+                            result = progressive.current
+                    else:
+                        # Long inputs are summarized in chunks; show progress as each one finishes
+                        for event in pipeline.summarize_stream(input_text, method=method.lower(), length=length.lower()):
+                            if event["stage"] == "final":
+                                result = event
+                            else:
+                                progress.caption(f"🧩 Summarized part {event['completed']}/{event['total']} "
+                                                 f"({event['stage']} round {event['round']})")
+                    progress.empty()
+                    summary = result["summary"]
                     if summary.startswith("❌") or summary.startswith("⚠️"):
                         st.error(summary)
                     else:
+                        if final_error:
+                            st.warning(f"⚠️ The AI summary could not be generated, so the quick extractive draft is shown. "
+                                       f"{final_error}")
+                        elif result["fallback"]:
+                            st.info(f"ℹ️ {method} backend is degraded; served by the {result['backend']} backend instead.")
                         st.session_state.output_text = summary
                         st.session_state.output_type = "summary"
-                        st.success("✅ Summary Generated Successfully!")
+                        if final_error:
+                            st.caption("📝 Draft (extractive)")
+                        else:
+                            st.success("✅ Summary Generated Successfully!")
                         st.text_area("Your Summary", summary, height=300, label_visibility="collapsed", key="summary_output")
                         summary_words = len(summary.split())
                         original_words = len(input_text.split())
@@ -303,7 +349,17 @@ with tab1:
         elif paraphrase_btn and input_text:
             with st.spinner("🔄 Paraphrasing with AI..."):
                 try:
-                    paraphrased = pipeline.paraphrase(input_text)
+                    # Render tokens as they stream in; the final event carries the full result
+                    live_output = st.empty()
+                    streamed = ""
+                    paraphrased = ""
+                    for event in pipeline.paraphrase_stream(input_text):
+                        if event["type"] == "delta":
+                            streamed += event["text"]
+                            live_output.markdown(streamed + "▌")
+                        elif event["type"] == "final":
+                            paraphrased = event["text"]
+                    live_output.empty()
                     if paraphrased.startswith("❌") or paraphrased.startswith("⚠️"):
                         st.error(paraphrased)
                     else:
@@ -0,0 +1,91 @@
+"""
+Microbenchmark of configuration lookups
+
+Compares the per-call cost of the old nested dot-path walk over the parsed
+YAML with the flattened snapshot lookup, the typed accessors and a value
+resolved once at construction, and times ColoredFormatter.format() with a
+per-record config lookup against the cached setting.
+
+Usage:
+    python benchmarks/benchmark_config_lookup.py
+    python benchmarks/benchmark_config_lookup.py --number 2000000
+"""
+
+import argparse
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from configure.config_manager import config
+from logging_system import ColoredFormatter
+
+KEY = 'summarization.extractive.short.max_length'
+
+
+def nested_get(data, key_path, default=None):
+    """The dot-path walk ConfigManager.get() did on every call before snapshots."""
+    value = data
+    try:
+        for key in key_path.split('.'):
+            value = value[key]
+        return value
+    except (KeyError, TypeError):
+        return default
+
+
+class PerRecordColoredFormatter(ColoredFormatter):
+    """ColoredFormatter as it was: the setting is looked up for every record."""
+
+    def format(self, record):
+        self.colored = nested_get(config.config, 'logging.console.colored', True)
+        return super().format(record)
+
+
+def per_call_ns(statement, number):
+    best = min(timeit.repeat(statement, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark configuration lookups")
+    parser.add_argument("--number", type=int, default=500000, help="Calls per timing run")
+    args = parser.parse_args()
+
+    data = config.config
+    snapshot = config.snapshot
+    resolved = config.get_int(KEY)
+
+    lookups = [
+        ("nested walk (before)", lambda: nested_get(data, KEY)),
+        ("config.get()", lambda: config.get(KEY)),
+        ("snapshot.get()", lambda: snapshot.get(KEY)),
+        ("config.get_int()", lambda: config.get_int(KEY)),
+        ("resolved at init", lambda: resolved),
+    ]
+    print(f"Lookup of {KEY}")
+    print(f"{'variant':<22} {'ns/call':>9}")
+    for name, statement in lookups:
+        print(f"{name:<22} {per_call_ns(statement, args.number):>9.1f}")
+
+    fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    record = logging.LogRecord("TextMorph", logging.INFO, __file__, 1, "API Call - hf | /x | success", None, None)
+    formatters = [
+        ("lookup per record", PerRecordColoredFormatter(fmt)),
+        ("resolved at init", ColoredFormatter(fmt)),
+    ]
+    number = max(1, args.number // 10)
+    print("\nColoredFormatter.format()")
+    print(f"{'variant':<22} {'ns/call':>9}")
+    for name, formatter in formatters:
+        def format_record(formatter=formatter):
+            record.levelname = "INFO"
+            formatter.format(record)
+        print(f"{name:<22} {per_call_ns(format_record, number):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
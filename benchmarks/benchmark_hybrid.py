@@ -0,0 +1,139 @@
+"""
+Benchmark of hybrid (extract-then-abstract) against full-text abstractive summarization
+
+Each document is summarized once from the full text and once per compression
+ratio from the locally condensed text. Reports tokens sent to the model,
+latency (p50/p95) and ROUGE-1/2/L of the hybrid summaries against the
+full-text ones. Pass --references to also score every variant against
+reference summaries.
+
+Usage:
+    python benchmarks/benchmark_hybrid.py
+    python benchmarks/benchmark_hybrid.py --ratios 0.2 0.4 0.6 --backend local --input reports.txt
+    python benchmarks/benchmark_hybrid.py --input reports.txt --references summaries.txt
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from benchmark_local_modes import SAMPLE_TEXTS, load_texts, rouge_l, rouge_n
+
+# Page furniture of the kind scraped articles carry, interleaved with the story
+BOILERPLATE = [
+    "Sign up for our newsletter to get the latest stories delivered to your inbox every morning.",
+    "This website uses cookies to improve your experience, and by continuing you accept our cookie policy.",
+    "Advertisement.",
+    "Share this article on social media or copy the link to send it to a friend.",
+    "Our journalism is supported by readers, so please consider subscribing for unlimited access.",
+    "Related coverage and more stories from this section are listed at the end of the page.",
+    "Comments are moderated and may take up to a day to appear below the article.",
+    "Copyright all rights reserved, and no part of this page may be reproduced without permission.",
+]
+
+
+def sample_documents():
+    """Boilerplate-heavy documents built from the sample articles."""
+    documents = []
+    for offset, text in enumerate(SAMPLE_TEXTS):
+        blocks = []
+        for i, sentence in enumerate(re.split(r"(?<=\.)\s+", text)):
+            blocks.append(sentence)
+            blocks.append(BOILERPLATE[(offset + i) % len(BOILERPLATE)])
+        documents.append(" ".join(blocks))
+    return documents
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def build_pipeline(backend):
+    from AbstractiveSummarizer import AbstractiveSummarizer
+    from combinedPipeline import SummarizationPipeline
+
+    pipeline = SummarizationPipeline(os.getenv("HF_API_KEY"))
+    # Measure the model, not the cache
+    pipeline.cache = None
+    pipeline.result_store = None
+    if backend:
+        pipeline.abstractive = AbstractiveSummarizer(os.getenv("HF_API_KEY"), backend=backend)
+    return pipeline
+
+
+def run_variant(pipeline, documents, length, ratio):
+    """Summarize every document with full text (ratio None) or hybrid at a compression ratio."""
+    rows = []
+    for document in documents:
+        started = time.perf_counter()
+        if ratio is None:
+            detail = pipeline.summarize_detailed(document, "abstractive", length)
+            detail["input_tokens"] = detail["condensed_tokens"] = pipeline._count_tokens(document)
+        else:
+            pipeline.compression_ratio = ratio
+            detail = pipeline.summarize_detailed(document, "hybrid", length)
+        detail["latency"] = time.perf_counter() - started
+        rows.append(detail)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hybrid vs full-text abstractive summarization")
+    parser.add_argument("--ratios", nargs="+", type=float, default=[0.2, 0.4, 0.6])
+    parser.add_argument("--input", help="Text file with documents separated by blank lines")
+    parser.add_argument("--references", help="Text file with one reference summary per document, blank-line separated")
+    parser.add_argument("--length", default="medium", choices=["short", "medium", "long"])
+    parser.add_argument("--backend", choices=["remote", "local"],
+                        help="Abstractive backend (default: summarization.abstractive.backend)")
+    parser.add_argument("--min-tokens", type=int, help="Override summarization.hybrid.min_tokens")
+    args = parser.parse_args()
+
+    documents = load_texts(args.input) if args.input else sample_documents()
+    references = load_texts(args.references) if args.references else None
+    pipeline = build_pipeline(args.backend)
+    if args.min_tokens is not None:
+        pipeline.hybrid_min_tokens = args.min_tokens
+    elif not args.input:
+        # The sample documents are short; let every ratio take effect
+        pipeline.hybrid_min_tokens = 0
+
+    variants = {"full": run_variant(pipeline, documents, args.length, None)}
+    for ratio in args.ratios:
+        variants[f"hybrid {ratio:.2f}"] = run_variant(pipeline, documents, args.length, ratio)
+    baseline = [row["summary"] for row in variants["full"]]
+
+    header = f"{'variant':<12} {'tokens':>7} {'p50 s':>7} {'p95 s':>7} {'R-1':>6} {'R-2':>6} {'R-L':>6}"
+    if references:
+        header += f" {'ref R-L':>8}"
+    print(header)
+    for name, rows in variants.items():
+        latencies = [row["latency"] for row in rows]
+        tokens = statistics.mean(row["condensed_tokens"] for row in rows)
+        pairs = list(zip(baseline, (row["summary"] for row in rows)))
+        scores = [
+            statistics.mean(score(ref, cand) for ref, cand in pairs)
+            for score in (lambda r, c: rouge_n(r, c, 1), lambda r, c: rouge_n(r, c, 2), rouge_l)
+        ]
+        line = (f"{name:<12} {tokens:>7.0f} {statistics.median(latencies):>7.3f} {percentile(latencies, 0.95):>7.3f} "
+                f"{scores[0]:>6.3f} {scores[1]:>6.3f} {scores[2]:>6.3f}")
+        if references:
+            line += f" {statistics.mean(rouge_l(r, row['summary']) for r, row in zip(references, rows)):>8.3f}"
+        fallbacks = sum(1 for row in rows if row["fallback"] or row["summary"].startswith(("❌", "⚠️")))
+        if fallbacks:
+            line += f"  ({fallbacks} fell back or failed)"
+        print(line)
+
+    print("\nR-1/R-2/R-L compare each variant's summaries against full-text abstractive (1.000 = identical).")
+    print(f"Average input tokens per document: {statistics.mean(row['input_tokens'] for row in variants['full']):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark of the local summarization model modes (fp32, int8, onnx)
+
+Each mode runs in its own process so peak RSS is measured in isolation.
+Reports load time, per-request latency (p50/p95), peak RSS and ROUGE drift
+of the int8/onnx summaries against the fp32 ones.
+
+Usage:
+    python benchmarks/benchmark_local_modes.py
+    python benchmarks/benchmark_local_modes.py --modes fp32 int8 --input articles.txt --length short
+"""
+
+import argparse
+import json
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+SAMPLE_TEXTS = [
+    "Artificial intelligence is transforming healthcare by helping doctors detect diseases earlier. "
+    "Machine learning models trained on medical images can flag tumours that radiologists might miss, "
+    "while language models summarise patient histories in seconds. Critics warn that biased training "
+    "data could worsen health inequalities, and regulators are drafting rules for clinical AI tools. "
+    "Hospitals adopting the technology report shorter waiting times but stress that final decisions "
+    "remain with clinicians.",
+    "The city council approved a plan to expand the public transit network over the next decade. "
+    "The proposal adds three light rail lines, electrifies the bus fleet and introduces a single fare "
+    "card across all services. Funding will come from a mix of federal grants, a regional sales tax "
+    "and private partnerships. Business groups welcomed the plan, saying better transit would ease "
+    "congestion, while some residents raised concerns about construction noise and rising property values.",
+    "Researchers have discovered a new species of frog in the cloud forests of the Andes. The tiny "
+    "amphibian, less than two centimetres long, was found during a survey of remote mountain streams. "
+    "Genetic analysis showed it is only distantly related to other frogs in the region. Scientists say "
+    "the discovery highlights how much biodiversity remains undocumented and how vulnerable such species "
+    "are to habitat loss and climate change.",
+]
+
+
+def _tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _f1(overlap, reference_count, candidate_count):
+    if not overlap:
+        return 0.0
+    precision = overlap / candidate_count
+    recall = overlap / reference_count
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(reference, candidate, n):
+    """ROUGE-N F1 between two texts."""
+    def grams(tokens):
+        counts = {}
+        for i in range(len(tokens) - n + 1):
+            gram = tuple(tokens[i:i + n])
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    ref, cand = grams(_tokens(reference)), grams(_tokens(candidate))
+    overlap = sum(min(count, cand.get(gram, 0)) for gram, count in ref.items())
+    return _f1(overlap, sum(ref.values()), sum(cand.values()))
+
+
+def rouge_l(reference, candidate):
+    """ROUGE-L F1 (longest common subsequence) between two texts."""
+    ref, cand = _tokens(reference), _tokens(candidate)
+    if not ref or not cand:
+        return 0.0
+    previous = [0] * (len(cand) + 1)
+    for r in ref:
+        current = [0]
+        for j, c in enumerate(cand, 1):
+            current.append(previous[j - 1] + 1 if r == c else max(previous[j], current[j - 1]))
+        previous = current
+    return _f1(previous[-1], len(ref), len(cand))
+
+
+def run_worker(mode, texts, length, model_name):
+    """Load one mode, summarize every text sequentially and print a JSON report."""
+    from configure.config_manager import config
+    from AbstractiveSummarizer import AbstractiveSummarizer
+    from local_inference import LocalSeq2SeqEngine
+
+    local_config = config.get('summarization.abstractive.local', {})
+    summarizer = AbstractiveSummarizer(None, backend='local')
+    summarizer.engine = LocalSeq2SeqEngine(
+        model_name=model_name or local_config.get('model', 'facebook/bart-large-cnn'),
+        num_threads=local_config.get('num_threads'),
+        max_input_tokens=local_config.get('max_input_tokens', 1024),
+        mode=mode,
+        model_dir=str(ROOT / local_config.get('model_dir', 'models')),
+    )
+
+    started = time.perf_counter()
+    summarizer.engine.load()
+    load_time = time.perf_counter() - started
+
+    latencies, summaries = [], []
+    for text in texts:
+        started = time.perf_counter()
+        summaries.append(summarizer.generate(text, length))
+        latencies.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "mode": mode,
+        "load_time": load_time,
+        "latencies": latencies,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "summaries": summaries,
+    }))
+
+
+def run_mode(mode, args):
+    command = [sys.executable, __file__, "--worker", mode, "--length", args.length]
+    if args.input:
+        command += ["--input", args.input]
+    if args.model:
+        command += ["--model", args.model]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    lines = completed.stdout.strip().splitlines()
+    if not lines:
+        return {"mode": mode, "error": completed.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(lines[-1])
+
+
+def load_texts(path):
+    if not path:
+        return SAMPLE_TEXTS
+    content = Path(path).read_text(encoding="utf-8")
+    return [block.strip() for block in re.split(r"\n\s*\n", content) if block.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local summarization model modes")
+    parser.add_argument("--modes", nargs="+", default=["fp32", "int8", "onnx"], choices=["fp32", "int8", "onnx"])
+    parser.add_argument("--input", help="Text file with articles separated by blank lines")
+    parser.add_argument("--length", default="medium", choices=["short", "medium", "long"])
+    parser.add_argument("--model", help="Model id (default: summarization.abstractive.local.model)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        try:
+            run_worker(args.worker, load_texts(args.input), args.length, args.model)
+        except Exception as e:
+            print(json.dumps({"mode": args.worker, "error": [getattr(e, "message", str(e))]}))
+        return
+
+    reports = {mode: run_mode(mode, args) for mode in args.modes}
+    baseline = reports.get("fp32")
+
+    print(f"{'mode':<6} {'load s':>8} {'p50 s':>8} {'p95 s':>8} {'RSS MB':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6}")
+    for mode, report in reports.items():
+        if "error" in report:
+            print(f"{mode:<6} failed: {report['error'][0]}")
+            continue
+        latencies = sorted(report["latencies"])
+        p50 = statistics.median(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+        drift = ["", "", ""]
+        if baseline and "error" not in baseline and mode != "fp32":
+            pairs = list(zip(baseline["summaries"], report["summaries"]))
+            drift = [
+                f"{statistics.mean(score(ref, cand) for ref, cand in pairs):.3f}"
+                for score in (lambda r, c: rouge_n(r, c, 1), lambda r, c: rouge_n(r, c, 2), rouge_l)
+            ]
+        print(f"{mode:<6} {report['load_time']:>8.2f} {p50:>8.3f} {p95:>8.3f} {report['peak_rss_mb']:>8.0f} "
+              f"{drift[0]:>6} {drift[1]:>6} {drift[2]:>6}")
+    if baseline and "error" not in baseline:
+        print("\nROUGE columns compare each mode's summaries against fp32 (1.000 = identical).")
+
+
+if __name__ == "__main__":
+    main()
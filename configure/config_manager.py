@@ -5,16 +5,154 @@ Handles loading and accessing configuration from config.yaml
 
 import yaml
 import os
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 from exceptions import ConfigurationError
 
 
+# Resolve config.yaml next to this module so loading does not depend on the cwd
+DEFAULT_CONFIG_PATH = str(Path(__file__).parent / "config.yaml")
+
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ConfigSnapshot:
+    """Immutable, flattened view of a loaded configuration.
+    
+    Every dot path (leaves and intermediate sections) is resolved once at
+    construction, so lookups are a single dict access. Sections are returned
+    as read-only mappings and lists as tuples.
+    """
+    
+    __slots__ = ('_values',)
+    
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Build the snapshot.
+        
+        Args:
+            data: Parsed configuration dictionary
+        """
+        values = {}
+        
+        def flatten(prefix: str, node: Mapping) -> None:
+            for key, item in node.items():
+                path = f"{prefix}.{key}" if prefix else str(key)
+                values[path] = item
+                if isinstance(item, Mapping):
+                    flatten(path, item)
+        
+        flatten('', _freeze(data or {}))
+        self._values = MappingProxyType(values)
+    
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """Get a value by dot path, or `default` if it is not set."""
+        value = self._values.get(key_path, _MISSING)
+        return default if value is _MISSING else value
+    
+    def _typed(self, key_path: str, default: Any, kind: type) -> Any:
+        value = self._values.get(key_path)
+        if type(value) is kind:
+            return value
+        if value is None:
+            return default
+        if kind is bool:
+            if isinstance(value, bool):
+                return value
+        elif not isinstance(value, bool):
+            try:
+                return kind(value)
+            except (TypeError, ValueError):
+                pass
+        raise ConfigurationError(
+            f"Configuration value {key_path}={value!r} is not a valid {kind.__name__}"
+        )
+    
+    def get_int(self, key_path: str, default: Optional[int] = None) -> Optional[int]:
+        """Get an integer value; raises ConfigurationError if it is not one."""
+        return self._typed(key_path, default, int)
+    
+    def get_float(self, key_path: str, default: Optional[float] = None) -> Optional[float]:
+        """Get a number as float; raises ConfigurationError if it is not one."""
+        return self._typed(key_path, default, float)
+    
+    def get_bool(self, key_path: str, default: Optional[bool] = None) -> Optional[bool]:
+        """Get a boolean value; raises ConfigurationError if it is not one."""
+        return self._typed(key_path, default, bool)
+    
+    def get_str(self, key_path: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a value as a string."""
+        return self._typed(key_path, default, str)
+    
+    def __contains__(self, key_path: str) -> bool:
+        return key_path in self._values
+    
+    def __len__(self) -> int:
+        return len(self._values)
+
+
 class ConfigManager:
     """Manages application configuration from YAML file."""
     
     _instance = None
     _config = None
+    _snapshot = None
+    
+    # Settings that must be positive numbers when present
+    POSITIVE_NUMBERS = (
+        'api.huggingface.timeout',
+        'api.groq.timeout',
+        'api.huggingface.deadline',
+        'api.groq.deadline',
+        'cache.ttl',
+        'config_reload.interval',
+        'summarization.hybrid.compression_ratio',
+    )
+    
+    # Settings that must be positive integers when present
+    POSITIVE_INTEGERS = (
+        'http.pool_connections',
+        'http.pool_maxsize',
+        'cache.max_size',
+        'cache.max_bytes',
+        'summarization.chunking.max_tokens',
+        'summarization.hybrid.max_tokens',
+        'summarization.progressive.max_workers',
+        'paraphrasing.segmented.auto_threshold_tokens',
+        'paraphrasing.segmented.max_segment_tokens',
+        'paraphrasing.segmented.max_concurrency',
+        'paraphrasing.segmented.max_output_tokens',
+        'performance.batch.max_concurrency',
+    )
+    
+    # Settings that must be zero or more when present (0 disables a rate-limit window)
+    NON_NEGATIVE_NUMBERS = (
+        'api.huggingface.retry_delay',
+        'api.groq.retry_delay',
+        'api.huggingface.max_retry_delay',
+        'api.groq.max_retry_delay',
+        'performance.rate_limit.max_wait',
+        'paraphrasing.segmented.temperature',
+    )
+    NON_NEGATIVE_INTEGERS = (
+        'api.huggingface.max_retries',
+        'api.groq.max_retries',
+        'summarization.hybrid.min_tokens',
+        'performance.rate_limit.max_requests_per_minute',
+        'performance.rate_limit.max_requests_per_hour',
+    )
     
     def __new__(cls):
         """Singleton pattern to ensure only one config instance."""
@@ -22,7 +160,7 @@ class ConfigManager:
             cls._instance = super(ConfigManager, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
         """
         Initialize the configuration manager.
         
@@ -31,10 +169,18 @@ class ConfigManager:
         """
         if self._config is None:
             self.config_path = config_path
+            self._subscribers = []
+            self._reload_lock = threading.Lock()
+            self._watcher = None
             self._load_config()
     
     def _load_config(self) -> None:
         """Load configuration from YAML file."""
+        self._config = self._read_config()
+        self._snapshot = ConfigSnapshot(self._config)
+    
+    def _read_config(self) -> Dict[str, Any]:
+        """Parse the YAML file without touching the active configuration."""
         try:
             config_file = Path(self.config_path)
             
@@ -44,10 +190,13 @@ class ConfigManager:
                 )
             
             with open(config_file, 'r', encoding='utf-8') as file:
-                self._config = yaml.safe_load(file)
+                data = yaml.safe_load(file)
             
-            if self._config is None:
+            if data is None:
                 raise ConfigurationError("Configuration file is empty")
+            if not isinstance(data, dict):
+                raise ConfigurationError("Configuration file must contain a mapping")
+            return data
                 
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Error parsing YAML config: {str(e)}")
@@ -69,15 +218,28 @@ class ConfigManager:
             config.get('api.huggingface.timeout')
             config.get('summarization.extractive.short.max_length')
         """
-        keys = key_path.split('.')
-        value = self._config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._snapshot.get(key_path, default)
+    
+    def get_int(self, key_path: str, default: Optional[int] = None) -> Optional[int]:
+        """Get an integer value (see ConfigSnapshot)."""
+        return self._snapshot.get_int(key_path, default)
+    
+    def get_float(self, key_path: str, default: Optional[float] = None) -> Optional[float]:
+        """Get a float value (see ConfigSnapshot)."""
+        return self._snapshot.get_float(key_path, default)
+    
+    def get_bool(self, key_path: str, default: Optional[bool] = None) -> Optional[bool]:
+        """Get a boolean value (see ConfigSnapshot)."""
+        return self._snapshot.get_bool(key_path, default)
+    
+    def get_str(self, key_path: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a string value (see ConfigSnapshot)."""
+        return self._snapshot.get_str(key_path, default)
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current immutable configuration snapshot."""
+        return self._snapshot
     
     def get_app_config(self) -> Dict[str, Any]:
         """Get application configuration."""
@@ -168,9 +330,92 @@ class ConfigManager:
         return self.get('performance', {})
     
     def reload(self) -> None:
-        """Reload configuration from file."""
-        self._config = None
-        self._load_config()
+        """
+        Reload configuration from file.
+        
+        The new file is parsed and validated, and every subscriber's `prepare`
+        step builds its settings from it; only then is the snapshot swapped in
+        (a single reference assignment, so readers see either the old or the
+        new configuration) and subscribers notified. If the file is invalid or
+        a `prepare` step fails, ConfigurationError is raised and the previous
+        configuration stays active. If a subscriber fails while applying it,
+        the previous configuration is restored, the subscribers notified so
+        far are called again with it, and ConfigurationError is raised.
+        """
+        with self._reload_lock:
+            data = self._read_config()
+            snapshot = ConfigSnapshot(data)
+            self._validate(snapshot)
+            subscribers = list(self._subscribers)
+            for callback, prepare in subscribers:
+                if prepare is None:
+                    continue
+                try:
+                    prepare(snapshot)
+                except Exception as e:
+                    raise ConfigurationError(f"Configuration rejected by {callback!r}: {e}") from e
+            
+            previous_data, previous = self._config, self._snapshot
+            self._config = data
+            self._snapshot = snapshot
+            
+            notified = []
+            for callback, _ in subscribers:
+                notified.append(callback)
+                try:
+                    callback(snapshot, previous)
+                except Exception as e:
+                    self._config = previous_data
+                    self._snapshot = previous
+                    self._roll_back(notified, previous, snapshot)
+                    raise ConfigurationError(
+                        f"Configuration rolled back, {callback!r} failed to apply it: {e}"
+                    ) from e
+    
+    @staticmethod
+    def _roll_back(callbacks, previous: ConfigSnapshot, rejected: ConfigSnapshot) -> None:
+        """Re-apply the previous snapshot to subscribers that already saw the rejected one."""
+        for callback in callbacks:
+            try:
+                callback(previous, rejected)
+            except Exception as e:
+                print(f"⚠️ Warning: Config subscriber {callback!r} failed to roll back: {e}", file=sys.stderr)
+    
+    def subscribe(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None],
+                  prepare: Optional[Callable[[ConfigSnapshot], Any]] = None) -> None:
+        """
+        Register a callback run after every successful reload.
+        
+        Args:
+            callback: Function taking (new_snapshot, previous_snapshot)
+            prepare: Function taking the candidate snapshot, run before it is
+                swapped in; raising rejects the reload (e.g. build derived settings)
+        """
+        self._subscribers.append((callback, prepare))
+    
+    def unsubscribe(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None]) -> None:
+        """Remove a callback registered with subscribe()."""
+        self._subscribers[:] = [entry for entry in self._subscribers if entry[0] != callback]
+    
+    def watch(self, interval: float = 2.0) -> "ConfigWatcher":
+        """
+        Start reloading the file automatically when it changes.
+        
+        Args:
+            interval: Seconds between checks of the file
+            
+        Returns:
+            The running ConfigWatcher (one per manager)
+        """
+        if self._watcher is None:
+            self._watcher = ConfigWatcher(self, interval)
+        self._watcher.start()
+        return self._watcher
+    
+    @property
+    def watcher(self) -> Optional["ConfigWatcher"]:
+        """The running ConfigWatcher, if watch() was called."""
+        return self._watcher
     
     @property
     def config(self) -> Dict[str, Any]:
@@ -184,6 +429,10 @@ class ConfigManager:
         Returns:
             True if valid, raises ConfigurationError otherwise
         """
+        return self._validate(self._snapshot)
+    
+    def _validate(self, snapshot: ConfigSnapshot) -> bool:
+        """Validate a snapshot: required sections exist and numeric settings have valid types and ranges."""
         required_keys = [
             'app',
             'api.huggingface',
@@ -195,16 +444,144 @@ class ConfigManager:
         ]
         
         for key in required_keys:
-            if self.get(key) is None:
+            if snapshot.get(key) is None:
                 raise ConfigurationError(f"Required configuration key missing: {key}")
         
+        for key in self.POSITIVE_NUMBERS:
+            self._check_range(key, snapshot.get_float(key), positive=True)
+        for key in self.POSITIVE_INTEGERS:
+            self._check_range(key, snapshot.get_int(key), positive=True)
+        for key in self.NON_NEGATIVE_NUMBERS:
+            self._check_range(key, snapshot.get_float(key), positive=False)
+        for key in self.NON_NEGATIVE_INTEGERS:
+            self._check_range(key, snapshot.get_int(key), positive=False)
+        
+        ratio = snapshot.get_float('summarization.hybrid.compression_ratio')
+        if ratio is not None and ratio > 1:
+            raise ConfigurationError(f"Configuration value summarization.hybrid.compression_ratio must be at most 1, got {ratio}")
+        
+        # Per-service rate-limit overrides take the same keys as the shared section
+        services = snapshot.get('performance.rate_limit.services') or {}
+        if not isinstance(services, Mapping):
+            raise ConfigurationError("Configuration value performance.rate_limit.services must be a mapping")
+        for service in services:
+            for window in ('max_requests_per_minute', 'max_requests_per_hour'):
+                key = f'performance.rate_limit.services.{service}.{window}'
+                self._check_range(key, snapshot.get_int(key), positive=False)
+        
         return True
     
+    @staticmethod
+    def _check_range(key: str, value: Optional[float], positive: bool) -> None:
+        if value is None:
+            return
+        if positive and value <= 0:
+            raise ConfigurationError(f"Configuration value {key} must be positive, got {value}")
+        if not positive and value < 0:
+            raise ConfigurationError(f"Configuration value {key} must not be negative, got {value}")
+    
     def __repr__(self) -> str:
         """String representation of ConfigManager."""
         return f"ConfigManager(config_path='{self.config_path}')"
 
 
+class ConfigWatcher:
+    """Polls the configuration file and reloads it when it changes.
+    
+    A change is detected from the file's modification time and size. The
+    reload waits until the file has looked the same on two consecutive
+    checks, so a save in progress is not picked up half-written. Invalid
+    files are rejected and the previous configuration stays active.
+    """
+    
+    def __init__(self, manager: ConfigManager, interval: float = 2.0):
+        """
+        Initialize the watcher.
+        
+        Args:
+            manager: ConfigManager to reload
+            interval: Seconds between checks
+        """
+        self.manager = manager
+        self.interval = interval
+        self._loaded = self._signature()
+        self._pending = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+        self.rejected = 0
+        self.last_error = None
+    
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.manager.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def check(self) -> bool:
+        """
+        Check the file once.
+        
+        Returns:
+            True if a new configuration was loaded
+        """
+        signature = self._signature()
+        if signature is None or signature == self._loaded:
+            self._pending = None
+            return False
+        if signature != self._pending:
+            # Changed since the last check; wait for it to settle
+            self._pending = signature
+            return False
+        
+        self._loaded = signature
+        self._pending = None
+        try:
+            self.manager.reload()
+        except ConfigurationError as e:
+            self.rejected += 1
+            self.last_error = str(e)
+            print(f"⚠️ Warning: Rejected configuration change: {e}", file=sys.stderr)
+            return False
+        self.reloads += 1
+        self.last_error = None
+        return True
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+    
+    def start(self) -> None:
+        """Start polling on a daemon thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="textmorph-config-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get reload counters.
+        
+        Returns:
+            Dictionary with reload and rejection counts and the last rejection reason
+        """
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "reloads": self.reloads,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
 # Create global config instance
 config = ConfigManager()
 
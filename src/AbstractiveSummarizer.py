@@ -1,24 +1,49 @@
+import asyncio
 import requests
 import os 
+from configure.config_manager import config, get_timeout
+from http_client import get_transport
+from async_http_client import get_async_transport
+from exceptions import HuggingFaceAPIError, SummarizationError
+from local_inference import get_local_engine
+from retry import RetryPolicy, classify_exception, format_api_error, raise_for_response
 
 class AbstractiveSummarizer:
-    """Abstractive summarization using BART model. Generates new sentences that capture the meaning of the original text."""
+    """Abstractive summarization using BART model. Generates new sentences that capture the meaning of the original text.
+
+    Uses the Hugging Face Inference API by default; set
+    `summarization.abstractive.backend: local` in config.yaml to run the model
+    in-process on CPU, with concurrent requests batched together.
+    """
     
-    def __init__(self, api_key): 
+    def __init__(self, api_key, backend=None, transport=None, async_transport=None, rate_limiter=None,
+                 retry_policy=None): 
         self.api_key = api_key 
         self.api_url = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn" 
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport or get_async_transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_config('huggingface')
+        self.model_name = "facebook/bart-large-cnn"
+        self.backend = backend or config.get('summarization.abstractive.backend', 'remote')
+        self.local_config = config.get('summarization.abstractive.local', {})
+        self.engine = get_local_engine(self.local_config) if self.backend == 'local' else None
+        self.reload_settings()
 
-    def summarize(self, text, length='medium'):
+    def reload_settings(self):
+        """Read the request timeout from config.yaml (again, after a reload)."""
+        self.timeout = get_timeout('huggingface')
+
+    def get_parameters(self, length='medium'):
         """
-        Generate abstractive summary from text.
-        
+        Get the generation parameters sent to the model for a summary length.
+
         Args:
-            text (str): Input text to summarize
             length (str): 'short', 'medium', or 'long'
-            
+
         Returns:
-            str: Generated summary
+            dict: Model parameters
         """
         length_map = {
             'short': {"max_length": 60, "min_length": 30},
@@ -27,33 +52,173 @@ class AbstractiveSummarizer:
         }
         
         params = length_map.get(length, length_map['medium'])
-        payload = {
-            "inputs": text,
-            "parameters": {
+        if self.backend == 'local':
+            return {
+                "backend": "local",
+                "model": self.engine.model_name,
+                "mode": self.engine.mode,
                 **params,
-                "do_sample": True,
-                "temperature": 0.7,
-                "top_p": 0.9
+                "num_beams": self.local_config.get('num_beams', 4),
+                "do_sample": False,
             }
+        return {
+            **params,
+            "do_sample": True,
+            "temperature": 0.7,
+            "top_p": 0.9
         }
 
-        try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
+    def summarize(self, text, length='medium'):
+        """
+        Generate abstractive summary from text.
+        
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
             
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("summary_text", "No summary generated")
-                else:
-                    return str(result)
-            elif response.status_code == 503:
-                return "⚠️ Model is loading. Please try again in a few moments."
-            else:
-                return f"❌ API Error: {response.status_code} - {response.text}"
-        except requests.exceptions.Timeout:
-            return "❌ Request timeout. Please try again."
+        Returns:
+            str: Generated summary
+        """
+        try:
+            return self.generate(text, length)
         except Exception as e:
-            return f"❌ Error: {str(e)}"
+            return format_api_error(e)
+
+    def generate(self, text, length='medium'):
+        """
+        Generate abstractive summary, retrying transient failures.
+
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            str: Generated summary
+
+        Raises:
+            TextMorphError subclasses (ModelLoadingError, RateLimitError,
+            APITimeoutError, NetworkError, HuggingFaceAPIError, ...) once
+            retries are exhausted
+        """
+        if self.backend == 'local':
+            return self._summarize_local(text, length)
+
+        payload = {
+            "inputs": text,
+            "parameters": self.get_parameters(length)
+        }
+        before = (lambda: self.rate_limiter.acquire('huggingface')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _post(self, payload, timeout):
+        """Send one request and return the parsed summary or raise a typed error."""
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        return self._parse_response(response)
+
+    def generate_batch(self, texts, length='medium'):
+        """
+        Summarize several texts that share the same parameters in one Inference API call.
+
+        Args:
+            texts (list): Input texts
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            list: One summary per text, in order
+        """
+        if self.backend == 'local':
+            return [self._summarize_local(text, length) for text in texts]
+
+        payload = {
+            "inputs": list(texts),
+            "parameters": self.get_parameters(length)
+        }
+        before = (lambda: self.rate_limiter.acquire('huggingface')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post_batch(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _post_batch(self, payload, timeout):
+        """Send one list-input request and return one summary per input."""
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        result = response.json()
+        if not isinstance(result, list) or len(result) != len(payload["inputs"]):
+            raise HuggingFaceAPIError(message="Unexpected batch response from Hugging Face", response=str(result)[:200])
+        return [item.get("summary_text", "No summary generated") for item in result]
+
+    async def summarize_async(self, text, length='medium'):
+        """
+        Generate abstractive summary from text without blocking the event loop.
+
+        Cancelling the awaiting task aborts the upstream request.
+
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            str: Generated summary
+        """
+        try:
+            return await self.generate_async(text, length)
+        except Exception as e:
+            return format_api_error(e)
+
+    async def generate_async(self, text, length='medium'):
+        """Async counterpart of generate(); raises typed errors once retries are exhausted."""
+        if self.backend == 'local':
+            try:
+                summary = await asyncio.wrap_future(self.engine.submit(text, self.get_parameters(length)))
+            except SummarizationError:
+                raise
+            except Exception as e:
+                raise SummarizationError(f"Local abstractive model failed: {e}", method="abstractive") from e
+            return summary or "No summary generated"
+
+        payload = {
+            "inputs": text,
+            "parameters": self.get_parameters(length)
+        }
+        before = (lambda: self.rate_limiter.acquire_async('huggingface')) if self.rate_limiter else None
+        return await self.retry_policy.call_async(
+            lambda timeout: self._post_async(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    async def _post_async(self, payload, timeout):
+        try:
+            response = await self.async_transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except Exception as e:
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        return self._parse_response(response)
+
+    def _summarize_local(self, text, length):
+        """Summarize with the resident local model; waits for the request's batch to run."""
+        try:
+            summary = self.engine.summarize(text, self.get_parameters(length))
+        except SummarizationError:
+            raise
+        except Exception as e:
+            raise SummarizationError(f"Local abstractive model failed: {e}", method="abstractive") from e
+        return summary or "No summary generated"
+
+    def _parse_response(self, response):
+        """Extract the summary text from a successful Inference API response."""
+        result = response.json()
+        if isinstance(result, list) and len(result) > 0:
+            return result[0].get("summary_text", "No summary generated")
+        else:
+            return str(result)
 
 
 if __name__ == "__main__":
@@ -1,53 +1,222 @@
+import asyncio
 import requests
+from configure.config_manager import config, get_timeout
+from extractive_engine import LocalExtractiveEngine
+from http_client import get_transport
+from async_http_client import get_async_transport
+from exceptions import HuggingFaceAPIError, SummarizationError
+from retry import RetryPolicy, classify_exception, format_api_error, raise_for_response
 
 class ExtractiveSummarizer:
-    """Extractive summarization using BART model. Selects important sentences from the original text."""
-    
-    def __init__(self, api_key):
+    """Extractive summarization. Selects important sentences from the original text.
+
+    Uses the local TF-IDF/TextRank engine by default; set
+    `summarization.extractive.backend: remote` in config.yaml to use the BART model
+    on the Hugging Face Inference API instead.
+    """
+
+    def __init__(self, api_key, backend=None, transport=None, async_transport=None, rate_limiter=None,
+                 retry_policy=None):
         self.api_key = api_key
         self.api_url = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport or get_async_transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_config('huggingface')
+        self.model_name = "facebook/bart-large-cnn"
+        self.backend = backend or config.get('summarization.extractive.backend', 'local')
+        self.engine = LocalExtractiveEngine.from_config(
+            config.get('summarization.extractive.local', {})
+        )
+        self.reload_settings()
 
-    def summarize(self, text, length='medium'):
+    def reload_settings(self):
+        """Read the timeout and local selection parameters from config.yaml (again, after a reload)."""
+        self.timeout = get_timeout('huggingface')
+        self.local_params = {length: self._local_parameters(length) for length in ('short', 'medium', 'long')}
+
+    @staticmethod
+    def _local_parameters(length):
+        sentence_map = {'short': 2, 'medium': 4, 'long': 6}
+        params = config.get_summarization_params('extractive', length) or \
+            config.get_summarization_params('extractive', 'medium')
+        return {
+            "backend": "local",
+            "max_sentences": params.get('max_sentences', sentence_map.get(length, 4)),
+            "max_words": params.get('max_length'),
+            "do_sample": False,
+        }
+
+    def get_parameters(self, length='medium'):
         """
-        Generate extractive summary from text.
-        
+        Get the parameters that determine the summary for a length.
+
         Args:
-            text (str): Input text to summarize
             length (str): 'short', 'medium', or 'long'
-            
+
         Returns:
-            str: Extracted summary
+            dict: Backend name plus its selection or model parameters
         """
+        if self.backend == 'local':
+            return dict(self.local_params.get(length, self.local_params['medium']))
+
         length_map = {
             'short': {"max_length": 60, "min_length": 30},
             'medium': {"max_length": 130, "min_length": 60},
             'long': {"max_length": 200, "min_length": 130}
         }
-        
+
         params = length_map.get(length, length_map['medium'])
-        payload = {
+        return {
+            "backend": "remote",
+            **params,
+            "do_sample": False
+        }
+
+    def summarize(self, text, length='medium'):
+        """
+        Generate extractive summary from text.
+
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            str: Extracted summary
+        """
+        try:
+            return self.generate(text, length)
+        except Exception as e:
+            return format_api_error(e)
+
+    def generate(self, text, length='medium'):
+        """
+        Generate extractive summary, raising typed errors instead of returning messages.
+
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            str: Extracted summary
+
+        Raises:
+            SummarizationError: If the local engine fails
+            TextMorphError subclasses from the remote backend once retries are exhausted
+        """
+        if self.backend == 'local':
+            return self._summarize_local(text, length)
+
+        payload = self._build_payload(length, text)
+        before = (lambda: self.rate_limiter.acquire('huggingface')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def generate_batch(self, texts, length='medium'):
+        """
+        Summarize several texts that share the same parameters; the remote backend sends one API call.
+
+        Args:
+            texts (list): Input texts
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            list: One summary per text, in order
+        """
+        if self.backend == 'local':
+            return [self._summarize_local(text, length) for text in texts]
+
+        payload = {**self._build_payload(length, None), "inputs": list(texts)}
+        before = (lambda: self.rate_limiter.acquire('huggingface')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post_batch(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _post_batch(self, payload, timeout):
+        """Send one list-input request and return one summary per input."""
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        result = response.json()
+        if not isinstance(result, list) or len(result) != len(payload["inputs"]):
+            raise HuggingFaceAPIError(message="Unexpected batch response from Hugging Face", response=str(result)[:200])
+        return [item.get("summary_text", "No summary generated") for item in result]
+
+    async def summarize_async(self, text, length='medium'):
+        """
+        Generate extractive summary from text without blocking the event loop.
+
+        The local engine runs in a worker thread; the remote backend uses the
+        shared aiohttp pool.
+
+        Args:
+            text (str): Input text to summarize
+            length (str): 'short', 'medium', or 'long'
+
+        Returns:
+            str: Extracted summary
+        """
+        try:
+            return await self.generate_async(text, length)
+        except Exception as e:
+            return format_api_error(e)
+
+    async def generate_async(self, text, length='medium'):
+        """Async counterpart of generate()."""
+        if self.backend == 'local':
+            return await asyncio.to_thread(self._summarize_local, text, length)
+
+        payload = self._build_payload(length, text)
+        before = (lambda: self.rate_limiter.acquire_async('huggingface')) if self.rate_limiter else None
+        return await self.retry_policy.call_async(
+            lambda timeout: self._post_async(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _summarize_local(self, text, length):
+        """Rank and select sentences on CPU without any network call."""
+        params = self.get_parameters(length)
+
+        try:
+            summary = self.engine.summarize(text, max_sentences=params["max_sentences"],
+                                            max_words=params["max_words"])
+        except Exception as e:
+            raise SummarizationError(f"Local extractive engine failed: {e}", method="extractive") from e
+        return summary or "No summary generated"
+
+    def _build_payload(self, length, text):
+        """Build the Inference API payload for the remote backend."""
+        params = self.get_parameters(length)
+        params.pop("backend")
+        return {
             "inputs": text,
-            "parameters": {
-                **params,
-                "do_sample": False
-            }
+            "parameters": params
         }
 
+    def _post(self, payload, timeout):
+        """Send one request and return the parsed summary or raise a typed error."""
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        return self._parse_response(response)
+
+    async def _post_async(self, payload, timeout):
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("summary_text", "No summary generated")
-                else:
-                    return str(result)
-            elif response.status_code == 503:
-                return "⚠️ Model is loading. Please try again in a few moments."
-            else:
-                return f"❌ API Error: {response.status_code} - {response.text}"
-        except requests.exceptions.Timeout:
-            return "⚠️ Request timeout. Please try again."
+            response = await self.async_transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
         except Exception as e:
-            return f"❌ Error: {str(e)}"
\ No newline at end of file
+            raise classify_exception(e, 'huggingface', timeout) from e
+        raise_for_response(response, 'huggingface', self.model_name)
+        return self._parse_response(response)
+
+    def _parse_response(self, response):
+        """Extract the summary text from a successful Inference API response."""
+        result = response.json()
+        if isinstance(result, list) and len(result) > 0:
+            return result[0].get("summary_text", "No summary generated")
+        else:
+            return str(result)
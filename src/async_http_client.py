@@ -0,0 +1,162 @@
+"""
+Async HTTP Transport for Text Morph
+Shared aiohttp connection pool for the asyncio API clients
+"""
+
+import asyncio
+import json as jsonlib
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+from configure.config_manager import config
+
+
+class AsyncResponse:
+    """Fully read HTTP response with the subset of the requests.Response API the clients use."""
+
+    __slots__ = ("status_code", "text", "headers")
+
+    def __init__(self, status_code: int, text: str, headers: Mapping[str, str]):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.text)
+
+
+class AsyncHTTPTransport:
+    """aiohttp session with a bounded, keep-alive connection pool.
+
+    An aiohttp session is bound to the event loop it was created on, so each
+    running loop gets its own session (e.g. threads that each call
+    `asyncio.run` on a shared pipeline, or successive Streamlit reruns). A
+    session is closed by its own loop when that loop shuts down.
+    """
+
+    def __init__(self, max_connections: int = 1000, max_connections_per_host: int = 100):
+        """
+        Initialize the async transport.
+
+        Args:
+            max_connections: Total simultaneous connections across hosts
+            max_connections_per_host: Simultaneous connections per host
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._guards = set()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                )
+                session = aiohttp.ClientSession(connector=connector)
+                self._sessions[loop] = session
+                self._keep_guard(loop.create_task(self._close_on_shutdown(session)))
+        return session
+
+    def _keep_guard(self, guard: asyncio.Task) -> None:
+        """Hold a strong reference to a guard task (asyncio only keeps weak ones); called under the lock."""
+        # Forget loops that have been closed, so they and their sessions can be collected
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            del self._sessions[loop]
+        self._guards -= {task for task in self._guards if task.get_loop().is_closed()}
+        self._guards.add(guard)
+        guard.add_done_callback(self._forget_guard)
+
+    def _forget_guard(self, guard: asyncio.Task) -> None:
+        with self._lock:
+            self._guards.discard(guard)
+
+    @staticmethod
+    async def _close_on_shutdown(session: aiohttp.ClientSession) -> None:
+        """Wait until cancelled, then close the session while its loop is still running.
+
+        asyncio.run() cancels leftover tasks before closing the loop, so the
+        session bound to that loop is closed with it.
+        """
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    async def post(self, url: str, headers: Optional[Dict[str, str]] = None,
+                   json: Any = None, timeout: Optional[float] = None) -> AsyncResponse:
+        """
+        Send a POST request over a pooled connection.
+
+        Args:
+            url: Request URL
+            headers: Request headers
+            json: JSON payload
+            timeout: Total timeout in seconds
+
+        Returns:
+            AsyncResponse with the body already read
+
+        Raises:
+            asyncio.TimeoutError: If the request exceeds `timeout`
+            aiohttp.ClientError: On connection failures
+        """
+        session = self._get_session()
+        self._requests += 1
+        try:
+            async with session.post(url, headers=headers, json=json,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                body = await response.text()
+                # Copy case-insensitively, like requests' headers (e.g. a lowercase retry-after)
+                return AsyncResponse(response.status, body, CIMultiDict(response.headers))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._errors += 1
+            raise
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            Dictionary with request and error counts
+        """
+        return {
+            "requests": self._requests,
+            "errors": self._errors,
+            "max_connections": self.max_connections,
+        }
+
+    async def close(self) -> None:
+        """Close the running event loop's session and its pooled connections."""
+        with self._lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_async_transport = None
+
+
+def get_async_transport() -> AsyncHTTPTransport:
+    """
+    Get the process-wide shared async transport, creating it from config.yaml on first use.
+
+    Returns:
+        Shared AsyncHTTPTransport instance
+    """
+    global _async_transport
+    if _async_transport is None:
+        _async_transport = AsyncHTTPTransport(
+            max_connections=config.get('http.async_max_connections', 1000),
+            max_connections_per_host=config.get('http.async_max_connections_per_host', 100),
+        )
+    return _async_transport
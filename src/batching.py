@@ -0,0 +1,197 @@
+"""
+Request Batching for Text Morph
+Collects concurrent requests into batches, for the local model and the Hugging Face API
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from configure.config_manager import config
+
+
+class DynamicBatcher:
+    """Groups concurrent requests into batches.
+
+    A collector thread takes the first queued request, then keeps collecting
+    for up to `max_wait` seconds or until `max_batch_size` requests are
+    queued. Requests with different group keys (e.g. different generation
+    parameters) are split into separate batches. Batches run on the collector
+    thread itself, or on a pool of `max_concurrent_batches` threads when more
+    than one batch may be in flight (e.g. network calls).
+    """
+
+    def __init__(self, process_batch: Callable[[Hashable, List[Any]], List[Any]], max_batch_size: int = 8,
+                 max_wait: float = 0.02, max_concurrent_batches: int = 1, name: str = "textmorph-batcher"):
+        """
+        Initialize the batcher.
+
+        Args:
+            process_batch: Function taking (group, items) and returning one result per item
+            max_batch_size: Largest batch handed to `process_batch`
+            max_wait: Seconds to wait for more requests after the first one arrives
+            max_concurrent_batches: Batches processed at the same time
+            name: Thread name prefix
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._executor = None
+        if max_concurrent_batches > 1:
+            self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.total_wait = 0.0
+
+    def submit(self, item: Any, group: Hashable = None) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Request payload passed to `process_batch`
+            group: Items are only batched with items of the same group
+
+        Returns:
+            Future resolving to the item's result
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((group, item, future, time.monotonic()))
+        return future
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List[Tuple[Hashable, Any, Future, float]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            groups = {}
+            for group, item, future, queued_at in self._collect():
+                # Skip requests whose caller already gave up
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault(group, []).append((item, future, queued_at))
+            for group, entries in groups.items():
+                if self._executor is not None:
+                    self._executor.submit(self._process, group, entries)
+                else:
+                    self._process(group, entries)
+
+    def _process(self, group: Hashable, entries: List[Tuple[Any, Future, float]]) -> None:
+        started = time.monotonic()
+        try:
+            results = self.process_batch(group, [item for item, _, _ in entries])
+        except Exception as e:
+            with self._lock:
+                self.failed_batches += 1
+            for _, future, _ in entries:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self.batches += 1
+            self.items += len(entries)
+            self.total_wait += sum(started - queued_at for _, _, queued_at in entries)
+        for (_, future, _), result in zip(entries, results):
+            future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching counters.
+
+        Returns:
+            Dictionary with batch and item counts, average batch size, calls saved,
+            average time spent queued and current queue depth
+        """
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "calls_saved": self.items - self.batches,
+                "avg_queue_wait_ms": round(self.total_wait / self.items * 1000, 1) if self.items else 0.0,
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+            }
+
+
+class HFMicroBatcher:
+    """Sends concurrent Hugging Face requests with matching parameters as one list-input call.
+
+    Requests are grouped by component (model endpoint), length and the full
+    parameter set, so only calls that would have produced the same request
+    settings share a batch. The component must provide
+    `generate_batch(texts, length)`.
+    """
+
+    def __init__(self, max_batch_size: int = 8, max_wait: float = 0.025, max_concurrent_batches: int = 4):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            max_batch_size: Most texts sent in one call
+            max_wait: Seconds to wait for more requests after the first one
+            max_concurrent_batches: Batch calls in flight at the same time
+        """
+        self.batcher = DynamicBatcher(self._send, max_batch_size=max_batch_size, max_wait=max_wait,
+                                      max_concurrent_batches=max_concurrent_batches,
+                                      name="textmorph-hf-batch")
+
+    @staticmethod
+    def _send(group: Tuple, texts: List[str]) -> List[str]:
+        component, length, _ = group
+        return component.generate_batch(texts, length)
+
+    def submit(self, component, text: str, length: str) -> Future:
+        """
+        Queue a text for the next batch call to the component's model.
+
+        Args:
+            component: Summarizer with generate_batch()
+            text: Input text
+            length: 'short', 'medium', or 'long'
+
+        Returns:
+            Future resolving to the summary (or raising the batch call's error)
+        """
+        params = tuple(sorted(component.get_parameters(length).items()))
+        return self.batcher.submit(text, group=(component, length, params))
+
+    def call(self, component, text: str, length: str) -> str:
+        """Summarize a text through the batcher, blocking until its batch returns."""
+        return self.submit(component, text, length).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching efficiency counters."""
+        return self.batcher.get_stats()
+
+    @classmethod
+    def from_config(cls) -> "HFMicroBatcher":
+        """Build a micro-batcher from `performance.micro_batch` in config.yaml."""
+        batch_config = config.get('performance.micro_batch', {})
+        return cls(
+            max_batch_size=batch_config.get('max_batch_size', 8),
+            max_wait=batch_config.get('max_wait_ms', 25) / 1000,
+            max_concurrent_batches=batch_config.get('max_concurrent_batches', 4),
+        )
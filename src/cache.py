@@ -0,0 +1,193 @@
+"""
+Response Cache for Text Morph
+In-process LRU cache with TTL expiry, bounded by entry count and total bytes
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from configure.config_manager import config
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
+
+def make_cache_key(text: str, method: str, length: str = None,
+                   params: Optional[Dict[str, Any]] = None, sampled: bool = False) -> str:
+    """
+    Build a cache key from the normalized text and request parameters.
+
+    Args:
+        text: Input text
+        method: Operation ('extractive', 'abstractive', 'paraphrase', ...)
+        length: Summary length bucket
+        params: Model parameters sent upstream
+        sampled: Whether the call uses sampling (kept in a separate namespace)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    namespace = "sampled" if sampled else "deterministic"
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    spec = json.dumps(
+        {"method": method, "length": length, "params": params or {}},
+        sort_keys=True, default=str,
+    )
+    spec_hash = hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+    return f"{namespace}:{method}:{spec_hash}:{text_hash}"
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache for generated summaries and paraphrases."""
+
+    def __init__(self, max_size: int = 100, ttl: float = 3600, max_bytes: int = 10485760):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Time to live in seconds
+            max_bytes: Maximum total size of cached values in bytes
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, str):
+            return len(value.encode("utf-8"))
+        return sys.getsizeof(value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss or expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            self._entries[key] = (value, time.monotonic() + self.ttl, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both bounds hold. Caller holds the lock."""
+        while self._entries and (len(self._entries) > self.max_size or self._bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def resize(self, max_size: int, ttl: float, max_bytes: int) -> None:
+        """
+        Change the bounds, evicting entries if the cache is now over them.
+
+        A new TTL applies to entries stored from now on.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Time-to-live in seconds
+            max_bytes: Maximum total size of cached values
+        """
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def settings_from_config(source=config) -> Dict[str, Any]:
+        """
+        Read the cache bounds from the `cache` section of config.yaml.
+
+        Args:
+            source: The config manager, or a reloaded ConfigSnapshot not yet applied
+        """
+        return {
+            "max_size": source.get_int('cache.max_size', 100),
+            "ttl": source.get_float('cache.ttl', source.get_float('performance.cache_ttl', 3600)),
+            "max_bytes": source.get_int('cache.max_bytes', 10485760),
+        }
+
+    @classmethod
+    def from_config(cls) -> "ResponseCache":
+        """Build a cache from the `cache` section of config.yaml."""
+        return cls(**cls.settings_from_config())
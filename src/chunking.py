@@ -0,0 +1,205 @@
+"""
+Chunking and Map-Reduce Summarization for Text Morph
+Splits long documents into token-budgeted chunks and summarizes them hierarchically
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List
+
+from configure.config_manager import config
+from extractive_engine import split_sentences
+
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the BPE token count of a text without loading a tokenizer.
+
+    Every word or punctuation mark counts as one token, plus one more per
+    8 characters of long words, which slightly over-counts BART's tokenizer
+    on English prose so chunks stay under the model's window.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+    """
+    return sum(1 + len(piece) // 8 for piece in _PIECE.findall(text))
+
+
+def _split_long_sentence(sentence: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Break a sentence that alone exceeds the budget into word runs that fit."""
+    parts, current = [], []
+    for word in sentence.split():
+        if current and count_tokens(" ".join(current + [word])) > max_tokens:
+            parts.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+def chunk_text(text: str, max_tokens: int = 900, overlap_tokens: int = 64,
+               count_tokens: Callable[[str], int] = estimate_tokens) -> List[str]:
+    """
+    Split text on sentence boundaries into chunks that fit a token budget.
+
+    Consecutive chunks share trailing sentences worth up to `overlap_tokens`
+    so context that straddles a boundary is seen by both.
+
+    Args:
+        text: Input text
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens of trailing context repeated at the start of the next chunk
+        count_tokens: Token counter (defaults to estimate_tokens)
+
+    Returns:
+        List of chunks in document order
+    """
+    sentences = []
+    for sentence in split_sentences(text):
+        if count_tokens(sentence) > max_tokens:
+            sentences.extend(_split_long_sentence(sentence, max_tokens, count_tokens))
+        else:
+            sentences.append(sentence)
+
+    chunks = []
+    current, current_tokens, fresh = [], 0, 0
+    for sentence in sentences:
+        tokens = count_tokens(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            # Carry trailing sentences into the next chunk as overlap
+            overlap, overlap_size = [], 0
+            for previous in reversed(current):
+                size = count_tokens(previous)
+                if overlap_size + size > overlap_tokens or overlap_size + size + tokens > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += size
+            current, current_tokens, fresh = overlap, overlap_size, 0
+        current.append(sentence)
+        current_tokens += tokens
+        fresh += 1
+    if current and fresh:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class MapReduceSummarizer:
+    """Hierarchical summarization for inputs longer than the model's window.
+
+    Map: every chunk is summarized concurrently (up to `fan_out` at a time).
+    Reduce: the partial summaries are joined in order; if the result still
+    exceeds the budget it is chunked and summarized again, for at most
+    `max_rounds` rounds. Final: the joined summaries are summarized once more
+    at the requested length.
+    """
+
+    def __init__(self, summarize_fn: Callable[[str, bool], str], max_tokens: int = 900,
+                 overlap_tokens: int = 64, fan_out: int = 4, max_rounds: int = 3,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize the map-reduce summarizer.
+
+        Args:
+            summarize_fn: Function taking (text, final) and returning a summary; raises on failure
+            max_tokens: Token budget per model call
+            overlap_tokens: Overlap between map chunks
+            fan_out: Maximum concurrent chunk summaries
+            max_rounds: Maximum map/reduce rounds before the final call
+            count_tokens: Token counter
+        """
+        self.summarize_fn = summarize_fn
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.fan_out = max(1, fan_out)
+        self.max_rounds = max(1, max_rounds)
+        self.count_tokens = count_tokens
+
+    def needs_chunking(self, text: str) -> bool:
+        """Whether a text exceeds the per-call token budget."""
+        return self.count_tokens(text) > self.max_tokens
+
+    def stream(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        Summarize a long text, yielding partial summaries as chunks finish.
+
+        Args:
+            text: Input text
+
+        Yields:
+            dict: {"stage": "map" | "reduce", "round", "index", "completed", "total", "summary"}
+            for each chunk, then {"stage": "final", "summary", "chunks", "rounds"}
+        """
+        chunks = chunk_text(text, self.max_tokens, self.overlap_tokens, self.count_tokens)
+        first_round_chunks = len(chunks)
+        rounds = 0
+        while len(chunks) > 1 and rounds < self.max_rounds:
+            rounds += 1
+            stage = "map" if rounds == 1 else "reduce"
+            partials = [None] * len(chunks)
+            with ThreadPoolExecutor(max_workers=min(self.fan_out, len(chunks)),
+                                    thread_name_prefix="textmorph-chunk") as executor:
+                futures = {executor.submit(self.summarize_fn, chunk, False): i for i, chunk in enumerate(chunks)}
+                try:
+                    for completed, future in enumerate(as_completed(futures), 1):
+                        index = futures[future]
+                        partials[index] = future.result()
+                        yield {
+                            "stage": stage,
+                            "round": rounds,
+                            "index": index,
+                            "completed": completed,
+                            "total": len(chunks),
+                            "summary": partials[index],
+                        }
+                finally:
+                    # Stop queued chunks if a chunk failed or the consumer went away
+                    for future in futures:
+                        future.cancel()
+
+            combined = "\n".join(partials)
+            if not self.needs_chunking(combined):
+                chunks = [combined]
+                break
+            reduced = chunk_text(combined, self.max_tokens, 0, self.count_tokens)
+            if len(reduced) >= len(chunks):
+                # Summaries are not getting shorter; stop and let the final call truncate
+                chunks = [combined]
+                break
+            chunks = reduced
+
+        source = chunks[0] if len(chunks) == 1 else "\n".join(chunks)
+        yield {
+            "stage": "final",
+            "summary": self.summarize_fn(source, True),
+            "chunks": first_round_chunks,
+            "rounds": rounds,
+        }
+
+    def summarize(self, text: str) -> str:
+        """Summarize a long text and return only the final summary."""
+        final = None
+        for event in self.stream(text):
+            final = event
+        return final["summary"]
+
+    @classmethod
+    def from_config(cls, summarize_fn: Callable[[str, bool], str],
+                    count_tokens: Callable[[str], int] = estimate_tokens) -> "MapReduceSummarizer":
+        """Build a map-reduce summarizer from `summarization.chunking` in config.yaml."""
+        chunk_config = config.get('summarization.chunking', {})
+        return cls(
+            summarize_fn,
+            max_tokens=chunk_config.get('max_tokens', 900),
+            overlap_tokens=chunk_config.get('overlap_tokens', 64),
+            fan_out=chunk_config.get('fan_out', 4),
+            max_rounds=chunk_config.get('max_rounds', 3),
+            count_tokens=count_tokens,
+        )
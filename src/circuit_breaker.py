@@ -0,0 +1,246 @@
+"""
+Circuit Breaker for Text Morph
+Fails fast on a degraded backend so callers can fall back instead of queueing behind timeouts
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+from configure.config_manager import config
+from exceptions import CircuitOpenError, RateLimitError
+from retry import is_retryable
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one backend.
+
+    Closed: calls pass through and their outcomes are recorded in a sliding
+    window. The breaker opens after `failure_threshold` consecutive failures,
+    or once the window holds `min_calls` outcomes and the failure or slow-call
+    rate reaches its threshold.
+
+    Open: calls are rejected immediately with CircuitOpenError until
+    `open_duration` has passed.
+
+    Half-open: up to `half_open_max_calls` probe calls are let through. A
+    successful probe closes the breaker; a failed one opens it again.
+
+    Only transient errors (timeouts, network errors, 5xx, rate limits, cold
+    models) count as failures; e.g. a rejected API key says nothing about
+    the backend's health. Calls refused by our own rate limiter are not
+    recorded at all.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, failure_rate: float = 0.5,
+                 slow_call_duration: float = 20.0, slow_call_rate: float = 0.5, window: int = 20,
+                 min_calls: int = 10, open_duration: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Backend name used in errors and status
+            failure_threshold: Consecutive failures that open the breaker
+            failure_rate: Failure fraction of the window that opens the breaker
+            slow_call_duration: Calls slower than this many seconds count as slow
+            slow_call_rate: Slow fraction of the window that opens the breaker
+            window: Number of recent outcomes considered for the rates
+            min_calls: Outcomes needed in the window before rates are evaluated
+            open_duration: Seconds to reject calls before probing again
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probes = 0
+        self.calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _open(self, now: float) -> None:
+        self.state = self.OPEN
+        self._opened_at = now
+        self._probes = 0
+        self.times_opened += 1
+
+    def _close(self) -> None:
+        self.state = self.CLOSED
+        self._outcomes.clear()
+        self._consecutive_failures = 0
+        self._probes = 0
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 when not open)."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_duration - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed, reserving a probe slot when half-open.
+
+        Returns:
+            True if the call may be sent to the backend
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.open_duration:
+                self.state = self.HALF_OPEN
+                self._probes = 0
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, duration: float, failed: bool) -> None:
+        """
+        Record the outcome of a call admitted by allow().
+
+        Args:
+            duration: Call duration in seconds
+            failed: Whether the call failed in a way that reflects backend health
+        """
+        slow = duration >= self.slow_call_duration
+        with self._lock:
+            now = time.monotonic()
+            self.calls += 1
+            if self.state == self.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._close()
+                return
+            if self.state == self.OPEN:
+                # A call admitted before the breaker opened; it no longer changes the state
+                return
+
+            self._outcomes.append((failed, slow))
+            self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open(now)
+                return
+            if len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for f, _ in self._outcomes if f)
+                slow_calls = sum(1 for _, s in self._outcomes if s)
+                if (failures / len(self._outcomes) >= self.failure_rate
+                        or slow_calls / len(self._outcomes) >= self.slow_call_rate):
+                    self._open(now)
+
+    def _release_probe(self) -> None:
+        """Return a probe slot for a call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._probes = max(0, self._probes - 1)
+
+    def _record_error(self, duration: float, error: Exception) -> None:
+        if isinstance(error, RateLimitError) and error.client_side:
+            # Throttled by our own limiter before anything was sent: not a backend outcome
+            self._release_probe()
+            return
+        self.record(duration, is_retryable(error))
+
+    def _reject(self) -> CircuitOpenError:
+        return CircuitOpenError(self.name, retry_after=self.retry_after())
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` through the breaker.
+
+        Args:
+            fn: Zero-argument function calling the backend
+
+        Returns:
+            Result of `fn`
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Whatever `fn` raised otherwise
+        """
+        if not self.allow():
+            raise self._reject()
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            self._record_error(time.monotonic() - started, e)
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self.record(time.monotonic() - started, False)
+        return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of call()."""
+        if not self.allow():
+            raise self._reject()
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._record_error(time.monotonic() - started, e)
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self.record(time.monotonic() - started, False)
+        return result
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get breaker state for monitoring.
+
+        Returns:
+            Dictionary with state, window rates and counters
+        """
+        retry_after = self.retry_after()
+        with self._lock:
+            outcomes = len(self._outcomes)
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            return {
+                "state": self.state,
+                "failure_rate": round(failures / outcomes, 3) if outcomes else 0.0,
+                "slow_call_rate": round(slow_calls / outcomes, 3) if outcomes else 0.0,
+                "consecutive_failures": self._consecutive_failures,
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "retry_after": round(retry_after, 1),
+            }
+
+    @classmethod
+    def from_config(cls, name: str) -> "CircuitBreaker":
+        """Build a breaker from `performance.circuit_breaker` in config.yaml, with per-backend overrides."""
+        base_config = config.get('performance.circuit_breaker', {})
+        breaker_config = {**base_config, **base_config.get('backends', {}).get(name, {})}
+        return cls(
+            name,
+            failure_threshold=breaker_config.get('failure_threshold', 5),
+            failure_rate=breaker_config.get('failure_rate', 0.5),
+            slow_call_duration=breaker_config.get('slow_call_duration', 20.0),
+            slow_call_rate=breaker_config.get('slow_call_rate', 0.5),
+            window=breaker_config.get('window', 20),
+            min_calls=breaker_config.get('min_calls', 10),
+            open_duration=breaker_config.get('open_duration', 30.0),
+            half_open_max_calls=breaker_config.get('half_open_max_calls', 1),
+        )
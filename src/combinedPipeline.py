@@ -1,6 +1,32 @@
+import asyncio
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from configure.config_manager import config
+from batching import HFMicroBatcher
+from cache import ResponseCache, make_cache_key
+from chunking import MapReduceSummarizer, chunk_text, estimate_tokens
+from circuit_breaker import CircuitBreaker
+from hedging import Hedger
+from http_client import get_transport
+from metrics import record_upstream, start_metrics_server, track_upstream
+from rate_limiter import RateLimiter
+from exceptions import SummarizationError, get_error_code
+from retry import RetryPolicy, format_api_error
+from result_store import ResultStore
+from single_flight import AsyncSingleFlight, SingleFlight
 from ExtractiveSummarizer import ExtractiveSummarizer
 from AbstractiveSummarizer import AbstractiveSummarizer
 from paraphraser import Paraphraser
+from progressive import ProgressiveSummary
+
+
+def _is_error(result):
+    """Components report failures as strings prefixed with ❌ or ⚠️."""
+    return isinstance(result, str) and result.startswith(("❌", "⚠️"))
+
 
 class SummarizationPipeline:
     """Combined pipeline for Summarization (HF) + Paraphrasing (GROQ LLM)."""
@@ -8,9 +34,24 @@ class SummarizationPipeline:
     def __init__(self, hf_api_key):
         print("🔧 Initializing SummarizationPipeline...")
 
+        # --- Shared HTTP transport ---
+        self.transport = get_transport()
+
+        # --- Client-side rate limiting per upstream service ---
+        self.rate_limiter = RateLimiter.from_config()
+
+        # --- Retry policies (shared per upstream service) ---
+        self.retry_policies = {
+            'huggingface': RetryPolicy.from_config('huggingface'),
+            'groq': RetryPolicy.from_config('groq'),
+        }
+
         # --- Extractive Summarizer ---
         try:
-            self.extractive = ExtractiveSummarizer(hf_api_key)
+            self.extractive = ExtractiveSummarizer(
+                hf_api_key, transport=self.transport, rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policies['huggingface'],
+            )
             print("✅ Extractive Summarizer loaded")
         except Exception as e:
             print(f"⚠️ Warning: Extractive Summarizer failed: {e}")
@@ -18,7 +59,10 @@ class SummarizationPipeline:
 
         # --- Abstractive Summarizer ---
         try:
-            self.abstractive = AbstractiveSummarizer(hf_api_key)
+            self.abstractive = AbstractiveSummarizer(
+                hf_api_key, transport=self.transport, rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policies['huggingface'],
+            )
             print("✅ Abstractive Summarizer loaded")
         except Exception as e:
             print(f"⚠️ Warning: Abstractive Summarizer failed: {e}")
@@ -26,44 +70,977 @@ class SummarizationPipeline:
 
         # --- GROQ Paraphraser ---
         try:
-            self.paraphraser = Paraphraser()
+            self.paraphraser = Paraphraser(
+                transport=self.transport, rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policies['groq'],
+            )
             print("✅ GROQ Paraphraser loaded")
         except Exception as e:
             print(f"⚠️ Warning: GROQ Paraphraser failed: {e}")
             self.paraphraser = None
 
+        # --- Local extractive engine (last-resort fallback, no network) ---
+        if self.extractive is not None and self.extractive.backend == 'local':
+            self.local_extractive = self.extractive
+        else:
+            try:
+                self.local_extractive = ExtractiveSummarizer(hf_api_key, backend='local')
+            except Exception as e:
+                print(f"⚠️ Warning: Local extractive engine failed: {e}")
+                self.local_extractive = None
+
+        # --- Circuit breakers and fallback routing between backends ---
+        self.breakers = {}
+        if config.get('performance.circuit_breaker.enabled', True):
+            self.breakers = {
+                name: CircuitBreaker.from_config(name) for name in ('abstractive', 'extractive', 'paraphrase')
+            }
+        if self.paraphraser is not None and self.paraphraser.pool is not None:
+            # Pool hits need no network call; only the pool's own Groq calls go through the breaker
+            self.paraphraser.pool.generate = self._generate_pooled
+
+        # --- Background workers for progressive (draft, then final) summaries ---
+        self.progressive_executor = ThreadPoolExecutor(
+            max_workers=config.get('summarization.progressive.max_workers', 4),
+            thread_name_prefix="textmorph-progressive",
+        )
+
+        # --- Response cache ---
+        caching = config.get('cache.enabled', True) and config.get('performance.enable_caching', True)
+        self.cache = ResponseCache.from_config() if caching else None
+
+        # --- Settings that can change on a config reload ---
+        self._load_settings()
+
+        # --- Persistent result store (shared across worker processes) ---
+        self.result_store = None
+        if config.get('result_store.enabled', False):
+            try:
+                self.result_store = ResultStore.from_config()
+                print("✅ Result store loaded")
+            except Exception as e:
+                print(f"⚠️ Warning: Result store failed: {e}")
+
+        # --- Micro-batching of concurrent Hugging Face calls (opt-in) ---
+        self.hf_batcher = HFMicroBatcher.from_config() if config.get('performance.micro_batch.enabled', False) else None
+
+        # --- Hedged requests against slow upstream replicas (opt-in) ---
+        self.hedger = Hedger.from_config() if config.get('performance.hedging.enabled', False) else None
+
+        # --- Coalescing of identical in-flight requests ---
+        coalescing = config.get('performance.single_flight', True)
+        self.single_flight = SingleFlight() if coalescing else None
+        self.async_single_flight = AsyncSingleFlight() if coalescing else None
+
+        # --- Latency and outcome metrics of upstream calls (Prometheus endpoint is opt-in) ---
+        self.metrics = config.get('metrics.enabled', True)
+        if self.metrics:
+            start_metrics_server()
+
+        # --- Hot reload of config.yaml ---
+        config.subscribe(self._apply_config, prepare=self._prepare_config)
+        if config.get('config_reload.enabled', True):
+            config.watch(config.get_float('config_reload.interval', 2.0))
+
+        if config.get('http.warm_up', False):
+            self.warm_up()
+
         print("✨ SummarizationPipeline initialized successfully!\n")
 
+    def _load_settings(self, source=config):
+        """Set the pipeline's per-request settings from config.yaml (or a reloaded snapshot)."""
+        for name, value in self._settings(source).items():
+            setattr(self, name, value)
+
+    def _settings(self, source):
+        """
+        Build the per-request settings without applying them.
+
+        Raises:
+            ConfigurationError: If a value has the wrong type
+        """
+        segmented = source.get_bool('paraphrasing.segmented.enabled', True)
+        return {
+            "fallbacks": (source.get('performance.circuit_breaker.fallback', {}) or {}) if self.breakers else {},
+
+            # --- Map-reduce summarization for inputs longer than the model window ---
+            "chunking": source.get_bool('summarization.chunking.enabled', True),
+            "chunk_max_tokens": source.get_int('summarization.chunking.max_tokens', 900),
+            "map_length": source.get_str('summarization.chunking.map_length', 'medium'),
+
+            # --- Hybrid summarization: condense locally, then summarize abstractively ---
+            "compression_ratio": source.get_float('summarization.hybrid.compression_ratio', 0.4),
+            "hybrid_min_tokens": source.get_int('summarization.hybrid.min_tokens', 200),
+            "hybrid_max_tokens": source.get_int('summarization.hybrid.max_tokens', 900),
+
+            # --- Progressive (draft, then final) summaries ---
+            "progressive": source.get_bool('summarization.progressive.enabled', True) and self.local_extractive is not None,
+
+            # --- Segment-parallel paraphrasing for long documents ---
+            "segmented_threshold": source.get_int('paraphrasing.segmented.auto_threshold_tokens', 600) if segmented else 0,
+            "segment_max_tokens": source.get_int('paraphrasing.segmented.max_segment_tokens', 300),
+            "segment_concurrency": source.get_int('paraphrasing.segmented.max_concurrency', 4),
+            "batch_concurrency": source.get_int('performance.batch.max_concurrency', 8),
+
+            "cache_sampled": source.get_bool('cache.cache_sampled', False),
+        }
+
+    def _prepare_config(self, snapshot):
+        """
+        Build everything a reloaded config.yaml changes, without applying it.
+
+        Run by the config manager before the snapshot is swapped in, so a value
+        that cannot be applied rejects the reload instead of leaving the
+        pipeline half-updated.
+
+        Returns:
+            dict of settings consumed by _apply_config()
+
+        Raises:
+            ConfigurationError: If a value has the wrong type
+        """
+        return {
+            "settings": self._settings(snapshot),
+            "pool": (snapshot.get_int('http.pool_connections', 10), snapshot.get_int('http.pool_maxsize', 10)),
+            "rate_limits": RateLimiter.limits_from_config(snapshot),
+            "rate_limit_max_wait": snapshot.get_float('performance.rate_limit.max_wait', 60),
+            "rate_limit_blocking": snapshot.get_str('performance.rate_limit.mode', 'wait') != 'try',
+            "cache": ResponseCache.settings_from_config(snapshot),
+            "retry": {service: RetryPolicy.from_config(service, snapshot) for service in self.retry_policies},
+        }
+
+    def _apply_config(self, snapshot, previous):
+        """
+        Apply a reloaded config.yaml to the running pipeline without dropping
+        warm connections, cached results or rate-limit state.
+
+        Resizes the HTTP pool, rate-limit windows and cache, and updates
+        timeouts, retry settings, the GROQ model and per-request settings.
+        Features switched on or off (e.g. circuit breakers, micro-batching)
+        and the local model still need a restart.
+        """
+        prepared = self._prepare_config(snapshot)
+        self._load_settings(snapshot)
+
+        self.transport.resize(*prepared["pool"])
+
+        self.rate_limiter.update_limits(prepared["rate_limits"])
+        self.rate_limiter.max_wait = prepared["rate_limit_max_wait"]
+        self.rate_limiter.blocking = prepared["rate_limit_blocking"]
+
+        if self.cache is not None:
+            self.cache.resize(**prepared["cache"])
+
+        for service, policy in self.retry_policies.items():
+            fresh = prepared["retry"][service]
+            policy.max_retries = fresh.max_retries
+            policy.base_delay = fresh.base_delay
+            policy.max_delay = fresh.max_delay
+            policy.deadline = fresh.deadline
+
+        for component in (self.extractive, self.abstractive, self.local_extractive, self.paraphraser):
+            if component is not None:
+                component.reload_settings()
+
+        model_name = snapshot.get('api.groq.model_name')
+        if self.paraphraser is not None and model_name and model_name != previous.get('api.groq.model_name'):
+            self.paraphraser.model_name = model_name
+
+        print("🔄 Configuration reloaded")
+
     # -------- Summarization --------
     def summarize(self, text, method="abstractive", length="medium"):
+        return self.summarize_detailed(text, method, length)["summary"]
+
+    def summarize_detailed(self, text, method="abstractive", length="medium"):
+        """
+        Summarize text and report which backend served the result.
+
+        If the requested backend fails or its circuit breaker is open, the
+        request moves down the fallback chain in config.yaml
+        (performance.circuit_breaker.fallback).
+
+        Inputs longer than the model window are summarized hierarchically
+        (see summarize_stream()). The 'hybrid' method instead keeps only the
+        most salient sentences within a token budget (summarization.hybrid),
+        chosen on CPU, and sends those to the abstractive model.
+
+        Args:
+            text: Input text
+            method: 'extractive', 'abstractive' or 'hybrid'
+            length: 'short', 'medium', or 'long'
+
+        Returns:
+            dict: {"summary", "method", "backend", "fallback", "cached"}
+            ('hybrid' adds "input_tokens" and "condensed_tokens")
+        """
+        if self._needs_map_reduce(text, method):
+            final = None
+            for event in self.summarize_stream(text, method, length):
+                final = event
+            return {key: final[key] for key in ("summary", "method", "backend", "fallback", "cached")}
+        return self._summarize_once(text, method, length)
+
+    def _summarize_once(self, text, method, length):
+        """Summarize text with a single model call (plus fallbacks)."""
+        detail = {"summary": None, "method": method, "backend": None, "fallback": False, "cached": False}
         if not text or not text.strip():
-            return "⚠️ No text provided."
+            detail["summary"] = "⚠️ No text provided."
+            return detail
+        if method == "hybrid":
+            return self._summarize_hybrid(text, length)
         try:
-            if method == "extractive":
-                if self.extractive is None:
-                    return "❌ Extractive Summarizer unavailable."
-                return self.extractive.summarize(text, length)
-            else:
-                if self.abstractive is None:
-                    return "❌ Abstractive Summarizer unavailable."
-                return self.abstractive.summarize(text, length)
+            component = self._backends().get(method)
+            if component is None:
+                detail["summary"] = f"❌ {method.capitalize()} Summarizer unavailable."
+                return detail
+            summary, backend, cached = self._cached_call(
+                text, method, length, component.get_parameters(length),
+                lambda: self._summarize_with_fallback(text, method, length),
+            )
+            detail.update(summary=summary, backend=backend, fallback=backend != method, cached=cached)
         except Exception as e:
-            return f"❌ Error: {e}"
+            detail["summary"] = f"❌ Error: {e}"
+        return detail
+
+    def summarize_progressive(self, text, method="abstractive", length="medium", on_update=None):
+        """
+        Return a local extractive draft immediately and finish the real summary in the background.
+
+        The draft comes from the local TF-IDF/TextRank engine and takes
+        milliseconds; the requested method runs through summarize_detailed()
+        on a worker thread (fallbacks and map-reduce included).
+
+        Args:
+            text: Input text
+            method: 'extractive' or 'abstractive'
+            length: 'short', 'medium', or 'long'
+            on_update: Optional callback, called with the draft now and with the final result later
+
+        Returns:
+            ProgressiveSummary: handle with `draft`, `future`, `current` and `result()`
+        """
+        future = self.progressive_executor.submit(self.summarize_detailed, text, method, length)
+        progressive = ProgressiveSummary(self._summarize_once(text, "local", length), future)
+        if on_update is not None:
+            progressive.on_update(on_update)
+        return progressive
+
+    # -------- Hybrid (extract, then abstract) --------
+    def _summarize_hybrid(self, text, length):
+        """
+        Cut text down to its most salient sentences locally and summarize only those abstractively.
+
+        Without the local extractive engine the text cannot be condensed, so
+        an over-budget input goes through map-reduce like a plain abstractive
+        request instead of being sent to the model whole.
+        """
+        condensed, input_tokens, condensed_tokens = self._condense(text)
+        detail = self.summarize_detailed(condensed, "abstractive", length)
+        detail.update(method="hybrid", input_tokens=input_tokens, condensed_tokens=condensed_tokens)
+        return detail
+
+    def _condense(self, text):
+        """
+        Select the top sentences of a text within the hybrid token budget.
+
+        The budget is `compression_ratio` of the input's tokens, but at least
+        `min_tokens` and at most `max_tokens` (summarization.hybrid), so short
+        inputs pass through unchanged and the result always fits one call.
+        Without the local extractive engine the text is returned unchanged;
+        callers summarize it with map-reduce when it exceeds the window.
+
+        Returns:
+            tuple: (condensed text, input tokens, condensed tokens)
+        """
+        input_tokens = self._count_tokens(text)
+        budget = min(self.hybrid_max_tokens, max(self.hybrid_min_tokens, int(input_tokens * self.compression_ratio)))
+        if input_tokens <= budget or self.local_extractive is None:
+            return text, input_tokens, input_tokens
+        condensed = self.local_extractive.engine.condense(text, budget, self._count_tokens)
+        return condensed, input_tokens, self._count_tokens(condensed)
+
+    # -------- Long documents --------
+    def summarize_stream(self, text, method="abstractive", length="medium"):
+        """
+        Summarize text, streaming partial summaries of long inputs as they finish.
+
+        Inputs over `summarization.chunking.max_tokens` are split on sentence
+        boundaries into slightly overlapping chunks, which are summarized
+        concurrently (`fan_out` at a time); the partial summaries are then
+        reduced until they fit one call. Shorter inputs produce a single
+        final event.
+
+        Args:
+            text: Input text
+            method: 'extractive' or 'abstractive'
+            length: Length of the final summary
+
+        Yields:
+            dict: {"stage": "map" | "reduce", "round", "index", "completed", "total", "summary"}
+            per chunk, then {"stage": "final", "summary", "method", "backend", "fallback",
+            "cached", "chunks", "rounds"}
+        """
+        if not self._needs_map_reduce(text, method):
+            yield {"stage": "final", **self._summarize_once(text, method, length), "chunks": 1, "rounds": 0}
+            return
+
+        backends = []
+
+        def summarize_part(part, final):
+            detail = self._summarize_once(part, method, length if final else self.map_length)
+            if _is_error(detail["summary"]):
+                raise SummarizationError(detail["summary"], method=method)
+            backends.append(detail["backend"])
+            return detail["summary"]
+
+        mapper = MapReduceSummarizer.from_config(summarize_part, count_tokens=self._count_tokens)
+        try:
+            for event in mapper.stream(text):
+                if event["stage"] == "final":
+                    event = {
+                        **event,
+                        "method": method,
+                        "backend": backends[-1],
+                        "fallback": any(backend != method for backend in backends),
+                        "cached": False,
+                    }
+                yield event
+        except SummarizationError as e:
+            yield {"stage": "final", "summary": e.message, "method": method, "backend": None,
+                   "fallback": False, "cached": False, "chunks": 0, "rounds": 0}
+
+    def _needs_map_reduce(self, text, method):
+        """BART-based backends have a ~1024-token window; the local extractive engine has none."""
+        if not self.chunking or not text or not text.strip():
+            return False
+        component = self._backends().get(method)
+        if component is None or (method == "extractive" and component.backend == "local"):
+            return False
+        return self._count_tokens(text) > self.chunk_max_tokens
+
+    def _count_tokens(self, text):
+        """Count tokens with the local model's tokenizer when it is loaded, else estimate."""
+        engine = getattr(self.abstractive, "engine", None)
+        if engine is not None and engine.tokenizer is not None:
+            return len(engine.tokenizer.encode(text))
+        return estimate_tokens(text)
 
     # -------- Paraphrasing --------
     def paraphrase(self, text, num_return_sequences=3):
+        """
+        Paraphrase text into numbered variations.
+
+        Inputs over `paraphrasing.segmented.auto_threshold_tokens` are
+        paraphrased segment by segment instead (see paraphrase_document()),
+        returning one rewritten document.
+        """
+        return self._paraphrase(text, num_return_sequences, pooled=True)
+
+    def _paraphrase(self, text, num_return_sequences, pooled):
+        """paraphrase(), optionally bypassing the variation pool (for one-off batch items)."""
+        if self.paraphraser is None:
+            return "❌ Paraphraser unavailable."
+        if not text or not text.strip():
+            return "⚠️ Please provide valid text."
+        if self.segmented_threshold and self._count_tokens(text) > self.segmented_threshold:
+            return self.paraphrase_document(text)
+        if pooled and self.paraphraser.pool is not None:
+            # Every click should bring new variations, so the pool bypasses the response
+            # cache; it is not hedged either, since a duplicate would consume pooled variations
+            try:
+                variations = self.paraphraser.paraphrase_pooled(text, num_return_sequences)
+                return "\n\n".join(variations)
+            except Exception as e:
+                return format_api_error(e)
+        try:
+            params = {**self.paraphraser.get_parameters(), "num_return_sequences": num_return_sequences}
+
+            def compute():
+                try:
+                    variations = self._guarded(
+                        "paraphrase", self.paraphraser, num_return_sequences,
+                        lambda: self.paraphraser.generate(text, num_return_sequences),
+                    )
+                    return "\n\n".join(variations), "paraphrase"
+                except Exception as e:
+                    return format_api_error(e), "paraphrase"
+
+            result, _, _ = self._cached_call(text, "paraphrase", None, params, compute)
+            return result
+        except Exception as e:
+            return f"❌ Error in paraphrasing: {e}"
+
+    def _generate_pooled(self, text, count):
+        """
+        Generate variations for the variation pool (on a miss or refill) through the paraphrase breaker.
+
+        These are the pool's only Groq calls, so misses and background refills
+        are recorded in the upstream metrics here; pool hits make no call and
+        are not.
+        """
+        generate = lambda: self.paraphraser.generate_variations(text, count)
+        breaker = self._breaker("paraphrase", self.paraphraser)
+        with self._track("paraphrase", self.paraphraser, count):
+            return breaker.call(generate) if breaker is not None else generate()
+
+    async def _generate_pooled_async(self, text, count):
+        """Async counterpart of _generate_pooled(), for a pool miss in paraphrase_async()."""
+        generate = lambda: self.paraphraser.generate_variations_async(text, count)
+        breaker = self._breaker("paraphrase", self.paraphraser)
+        with self._track("paraphrase", self.paraphraser, count):
+            return await (breaker.call_async(generate) if breaker is not None else generate())
+
+    def paraphrase_document(self, text, max_concurrency=None):
+        """
+        Paraphrase a long document segment by segment, in parallel.
+
+        The text is split into paragraphs, and long paragraphs into sentence
+        groups of at most `paraphrasing.segmented.max_segment_tokens`. Segments
+        are rewritten concurrently under the rate limiter and reassembled in
+        their original order. Each segment is cached on its own, so after an
+        edit only the changed segments are sent again.
+
+        Args:
+            text: Input document
+            max_concurrency: Parallel segment calls (default: paraphrasing.segmented.max_concurrency)
+
+        Returns:
+            str: Paraphrased document or error message
+        """
+        if self.paraphraser is None:
+            return "❌ Paraphraser unavailable."
+        if not text or not text.strip():
+            return "⚠️ Please provide valid text."
+        for event in self._paraphrase_segments(text, max_concurrency):
+            if event["type"] == "final":
+                return event["text"]
+
+    def _paraphrase_segments(self, text, max_concurrency=None):
+        """
+        Rewrite a document's segments concurrently, yielding them in document order.
+
+        Yields:
+            dict: {"type": "delta", "text"} with each rewritten segment (and the
+            separator before it) as soon as it and all earlier segments are done,
+            then {"type": "final", "text", "cached"} with the whole document or
+            the first error
+        """
+        max_tokens = self.segment_max_tokens
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+        segments = [chunk_text(p, max_tokens, 0, self._count_tokens) for p in paragraphs]
+        flat = [segment for paragraph in segments for segment in paragraph]
+        params = self.paraphraser.get_rewrite_parameters()
+
+        def rewrite(segment):
+            def compute():
+                try:
+                    rewritten = self._guarded(
+                        "paraphrase", self.paraphraser, "segment", lambda: self.paraphraser.rewrite(segment),
+                    )
+                    return rewritten, "paraphrase_segment"
+                except Exception as e:
+                    return format_api_error(e), "paraphrase_segment"
+
+            # Segments are cached even though they are sampled; reuse is the point
+            result, _, _ = self._cached_call(segment, "paraphrase_segment", None, params, compute,
+                                             always_cache=True)
+            return result
+
+        # Separator before each segment: a space within a paragraph, a blank line between paragraphs
+        separators = [
+            ("\n\n" if p and i == 0 else " " if i else "")
+            for p, paragraph in enumerate(segments) for i in range(len(paragraph))
+        ]
+        limit = max(1, max_concurrency or self.segment_concurrency)
+        with ThreadPoolExecutor(max_workers=min(limit, len(flat)), thread_name_prefix="textmorph-segment") as executor:
+            document = []
+            for separator, result in zip(separators, executor.map(rewrite, flat)):
+                if _is_error(result):
+                    yield {"type": "final", "text": result, "cached": False}
+                    return
+                document.append(separator + result)
+                yield {"type": "delta", "text": separator + result}
+        yield {"type": "final", "text": "".join(document), "cached": False}
+
+    def paraphrase_stream(self, text, num_return_sequences=3):
+        """
+        Paraphrase text, streaming tokens and variations as Groq generates them.
+
+        Args:
+            text: Input text
+            num_return_sequences: Number of variations
+
+        Inputs over `paraphrasing.segmented.auto_threshold_tokens` are
+        paraphrased segment by segment instead (see paraphrase_document()),
+        each rewritten segment streamed as a delta in document order.
+
+        With the variation pool enabled, unseen pooled variations are returned
+        at once (a repeat "Paraphrase" click) and only a pool miss is streamed;
+        streamed variations are then added to the pool as shown, and the pool
+        fills up in the background for the next request.
+
+        Yields:
+            dict: {"type": "delta", "text"} and {"type": "variation", "index", "text"}
+            while streaming, then {"type": "final", "text", "cached"} where `text`
+            matches what paraphrase() returns (`cached` is also True when it came
+            from the variation pool)
+        """
+        if self.paraphraser is None:
+            yield {"type": "final", "text": "❌ Paraphraser unavailable.", "cached": False}
+            return
+        if not text or not text.strip():
+            yield {"type": "final", "text": "⚠️ Please provide valid text.", "cached": False}
+            return
+        if self.segmented_threshold and self._count_tokens(text) > self.segmented_threshold:
+            yield from self._paraphrase_segments(text)
+            return
+
+        pooling = self.paraphraser.pool is not None
+        if pooling:
+            # Every click should bring new variations, so the pool replaces the response cache
+            pooled = self.paraphraser.take_pooled(text, num_return_sequences)
+            if pooled:
+                yield {"type": "final", "text": "\n\n".join(pooled), "cached": True}
+                return
+            key, use_cache = None, False
+        else:
+            params = {**self.paraphraser.get_parameters(), "num_return_sequences": num_return_sequences}
+            key, use_cache, cached = self._cache_lookup(text, "paraphrase", None, params)
+            if cached is not None:
+                yield {"type": "final", "text": cached, "cached": True}
+                return
+
+        breaker = self._breaker("paraphrase", self.paraphraser)
+        # Upstream latency is the time spent producing events, not the consumer's time between them
+        elapsed, resumed, finished = 0.0, time.perf_counter(), False
+        try:
+            open_stream = lambda: self.paraphraser.open_stream(text, num_return_sequences)
+            response = breaker.call(open_stream) if breaker is not None else open_stream()
+            for event in self.paraphraser.paraphrase_stream(text, num_return_sequences, response=response):
+                elapsed += time.perf_counter() - resumed
+                if event["type"] == "final":
+                    result = "\n\n".join(event["variations"])
+                    self._cache_store(key, use_cache, result)
+                    if pooling and not _is_error(result):
+                        self.paraphraser.add_to_pool(text, event["variations"])
+                    event = {"type": "final", "text": result, "cached": False}
+                    self._record("paraphrase_stream", self.paraphraser, num_return_sequences, "success", elapsed)
+                    finished = True
+                yield event
+                resumed = time.perf_counter()
+        except GeneratorExit:
+            if not finished:
+                self._record("paraphrase_stream", self.paraphraser, num_return_sequences, "cancelled", elapsed)
+            raise
+        except Exception as e:
+            elapsed += time.perf_counter() - resumed
+            self._record("paraphrase_stream", self.paraphraser, num_return_sequences,
+                         get_error_code(e).lower(), elapsed)
+            yield {"type": "final", "text": format_api_error(e), "cached": False}
+
+    # -------- Async API --------
+    async def summarize_async(self, text, method="abstractive", length="medium", timeout=None):
+        """
+        Async counterpart of summarize().
+
+        Args:
+            text: Input text
+            method: 'extractive' or 'abstractive'
+            length: 'short', 'medium', or 'long'
+            timeout: Optional overall timeout in seconds
+
+        Returns:
+            str: Summary or error message
+        """
+        return (await self.summarize_detailed_async(text, method, length, timeout))["summary"]
+
+    async def summarize_detailed_async(self, text, method="abstractive", length="medium", timeout=None):
+        """Async counterpart of summarize_detailed()."""
+        if method == "hybrid":
+            condensed, input_tokens, condensed_tokens = self._condense(text or "")
+            detail = await self.summarize_detailed_async(condensed, "abstractive", length, timeout)
+            detail.update(method="hybrid", input_tokens=input_tokens, condensed_tokens=condensed_tokens)
+            return detail
+        if self._needs_map_reduce(text, method):
+            # Map-reduce fans out on its own thread pool
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self.summarize_detailed, text, method, length), timeout,
+                )
+            except asyncio.TimeoutError:
+                return {"summary": "❌ Request timeout. Please try again.", "method": method, "backend": None,
+                        "fallback": False, "cached": False}
+        detail = {"summary": None, "method": method, "backend": None, "fallback": False, "cached": False}
+        if not text or not text.strip():
+            detail["summary"] = "⚠️ No text provided."
+            return detail
+        try:
+            component = self._backends().get(method)
+            if component is None:
+                detail["summary"] = f"❌ {method.capitalize()} Summarizer unavailable."
+                return detail
+            summary, backend, cached = await asyncio.wait_for(
+                self._cached_call_async(
+                    text, method, length, component.get_parameters(length),
+                    lambda: self._summarize_with_fallback_async(text, method, length),
+                ),
+                timeout,
+            )
+            detail.update(summary=summary, backend=backend, fallback=backend != method, cached=cached)
+        except asyncio.TimeoutError:
+            detail["summary"] = "❌ Request timeout. Please try again."
+        except Exception as e:
+            detail["summary"] = f"❌ Error: {e}"
+        return detail
+
+    async def paraphrase_async(self, text, num_return_sequences=3, timeout=None):
+        """
+        Async counterpart of paraphrase().
+
+        Args:
+            text: Input text
+            num_return_sequences: Number of variations
+            timeout: Optional overall timeout in seconds
+
+        Returns:
+            str: Paraphrased variations or error message
+        """
         if self.paraphraser is None:
             return "❌ Paraphraser unavailable."
+        if not text or not text.strip():
+            return "⚠️ Please provide valid text."
+        if self.segmented_threshold and self._count_tokens(text) > self.segmented_threshold:
+            # Segments fan out on their own thread pool
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(self.paraphrase_document, text), timeout)
+            except asyncio.TimeoutError:
+                return "❌ Request timeout. Please try again."
+        if self.paraphraser.pool is not None:
+            # A pool hit only takes a lock; a miss is generated on the async transport
+            try:
+                variations = await asyncio.wait_for(
+                    self.paraphraser.paraphrase_pooled_async(text, num_return_sequences, self._generate_pooled_async),
+                    timeout,
+                )
+                return "\n\n".join(variations)
+            except asyncio.TimeoutError:
+                return "❌ Request timeout. Please try again."
+            except Exception as e:
+                return format_api_error(e)
         try:
-            results = self.paraphraser.paraphrase(text, num_return_sequences)
-            return "\n\n".join(results)
+            params = {**self.paraphraser.get_parameters(), "num_return_sequences": num_return_sequences}
+
+            async def compute():
+                try:
+                    variations = await self._guarded_async(
+                        "paraphrase", self.paraphraser, num_return_sequences,
+                        lambda: self.paraphraser.generate_async(text, num_return_sequences),
+                    )
+                    return "\n\n".join(variations), "paraphrase"
+                except Exception as e:
+                    return format_api_error(e), "paraphrase"
+
+            result, _, _ = await asyncio.wait_for(
+                self._cached_call_async(text, "paraphrase", None, params, compute),
+                timeout,
+            )
+            return result
+        except asyncio.TimeoutError:
+            return "❌ Request timeout. Please try again."
         except Exception as e:
             return f"❌ Error in paraphrasing: {e}"
 
+    # -------- Fallback routing --------
+    def _backends(self):
+        return {
+            "abstractive": self.abstractive,
+            "extractive": self.extractive,
+            "local": self.local_extractive,
+        }
+
+    def _fallback_chain(self, method):
+        """Yield (name, component) for the requested backend and its fallbacks, skipping duplicates."""
+        backends = self._backends()
+        seen = set()
+        for name in [method, *self.fallbacks.get(method, [])]:
+            component = backends.get(name)
+            if component is None or id(component) in seen:
+                continue
+            seen.add(id(component))
+            yield name, component
+
+    def _summarize_with_fallback(self, text, method, length):
+        """
+        Try the requested backend, then each fallback, until one succeeds.
+
+        Returns:
+            tuple: (summary or error message, name of the backend that served it)
+        """
+        error = None
+        for name, component in self._fallback_chain(method):
+            try:
+                summary = self._guarded(name, component, length,
+                                        lambda c=component: self._generate(c, text, length))
+                return summary, name
+            except Exception as e:
+                error = e
+        return format_api_error(error), method
+
+    async def _summarize_with_fallback_async(self, text, method, length):
+        """Async counterpart of _summarize_with_fallback()."""
+        error = None
+        for name, component in self._fallback_chain(method):
+            try:
+                summary = await self._guarded_async(
+                    name, component, length, lambda c=component: self._generate_async(c, text, length),
+                )
+                return summary, name
+            except Exception as e:
+                error = e
+        return format_api_error(error), method
+
+    def _generate(self, component, text, length):
+        """Call a summarizer directly, or through the micro-batcher for remote Hugging Face backends."""
+        if self.hf_batcher is not None and getattr(component, "backend", "remote") != "local":
+            return self.hf_batcher.call(component, text, length)
+        return component.generate(text, length)
+
+    async def _generate_async(self, component, text, length):
+        if self.hf_batcher is not None and getattr(component, "backend", "remote") != "local":
+            return await asyncio.wrap_future(self.hf_batcher.submit(component, text, length))
+        return await component.generate_async(text, length)
+
+    def _guarded(self, name, component, bucket, compute):
+        """Run a backend call through its circuit breaker (remote backends only) and the hedger."""
+        breaker = self._breaker(name, component)
+        call = lambda: self._hedged(component, (name, bucket), compute)
+        with self._track(name, component, bucket):
+            return breaker.call(call) if breaker is not None else call()
+
+    async def _guarded_async(self, name, component, bucket, compute):
+        breaker = self._breaker(name, component)
+        call = lambda: self._hedged_async(component, (name, bucket), compute)
+        with self._track(name, component, bucket):
+            return await (breaker.call_async(call) if breaker is not None else call())
+
+    def _track(self, name, component, bucket):
+        """Record latency and outcome of a backend call, labelled by service, method and length bucket."""
+        if not self.metrics:
+            return nullcontext()
+        return track_upstream(self._service(component), name, bucket)
+
+    def _record(self, name, component, bucket, outcome, duration):
+        """Record a backend call the caller timed itself (e.g. a stream, excluding the consumer's time)."""
+        if self.metrics:
+            record_upstream(self._service(component), name, bucket, outcome, duration)
+
+    def _service(self, component):
+        if getattr(component, "backend", "remote") == "local":
+            return "local"
+        return "groq" if component is self.paraphraser else "huggingface"
+
+    def _breaker(self, name, component):
+        if getattr(component, "backend", "remote") == "local":
+            return None
+        return self.breakers.get(name)
+
+    # -------- Hedging --------
+    def _should_hedge(self, component):
+        """Only remote calls are hedged; the local extractive engine has no slow replicas."""
+        return self.hedger is not None and getattr(component, "backend", "remote") != "local"
+
+    def _hedged(self, component, bucket, compute):
+        if not self._should_hedge(component):
+            return compute()
+        return self.hedger.call(bucket, compute)
+
+    async def _hedged_async(self, component, bucket, compute):
+        if not self._should_hedge(component):
+            return await compute()
+        return await self.hedger.call_async(bucket, compute)
+
+    # -------- Caching --------
+    def _cache_lookup(self, text, method, length, params, always_cache=False):
+        """
+        Build the request key and look it up in the in-process cache and the
+        persistent result store.
+
+        Sampled calls (do_sample or temperature > 0) are kept in their own key
+        namespace and only cached when cache.cache_sampled is enabled, unless
+        `always_cache` is set.
+
+        Returns:
+            tuple: (key, use_cache, cached result or None)
+        """
+        sampled = bool(params.get("do_sample", params.get("temperature", 0) > 0))
+        key = make_cache_key(text, method, length, params, sampled=sampled)
+        use_cache = always_cache or not (sampled and not self.cache_sampled)
+
+        if use_cache:
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return key, use_cache, cached
+            if self.result_store is not None:
+                stored = self.result_store.get(key)
+                if stored is not None:
+                    if self.cache is not None:
+                        self.cache.set(key, stored)
+                    return key, use_cache, stored
+        return key, use_cache, None
+
+    def _cache_store(self, key, use_cache, result):
+        if use_cache and not _is_error(result):
+            if self.cache is not None:
+                self.cache.set(key, result)
+            if self.result_store is not None:
+                self.result_store.put(key, result)
+
+    def _cached_call(self, text, method, length, params, compute, always_cache=False):
+        """
+        Serve a request from cache, or compute it and populate the caches.
+
+        `compute` returns (result, backend). Results served by a fallback
+        backend are not cached under the requested method's key.
+        Concurrent identical misses share one upstream call via single-flight.
+
+        Returns:
+            tuple: (result, backend, cached)
+        """
+        key, use_cache, cached = self._cache_lookup(text, method, length, params, always_cache)
+        if cached is not None:
+            return cached, method, True
+
+        def load():
+            result, backend = compute()
+            # Populate caches before followers are released so later callers hit them
+            if backend == method:
+                self._cache_store(key, use_cache, result)
+            return result, backend, False
+
+        if self.single_flight is None:
+            return load()
+        return self.single_flight.do(key, load)
+
+    async def _cached_call_async(self, text, method, length, params, compute):
+        """Async counterpart of _cached_call(); `compute` returns a coroutine."""
+        key, use_cache, cached = self._cache_lookup(text, method, length, params)
+        if cached is not None:
+            return cached, method, True
+
+        async def load():
+            result, backend = await compute()
+            if backend == method:
+                self._cache_store(key, use_cache, result)
+            return result, backend, False
+
+        if self.async_single_flight is None:
+            return await load()
+        return await self.async_single_flight.do(key, load)
+
+    # -------- Batch processing --------
+    def summarize_many(self, texts, method="abstractive", length="medium", max_concurrency=None):
+        """
+        Summarize an iterable of texts concurrently.
+
+        Results are yielded in input order as soon as each one (and all before it)
+        completes. At most `2 * max_concurrency` items are held in memory, so `texts`
+        can be a lazy iterable larger than RAM.
+
+        Args:
+            texts: Iterable of input texts
+            method: 'extractive' or 'abstractive'
+            length: 'short', 'medium', or 'long'
+            max_concurrency: Maximum parallel calls (default: performance.batch.max_concurrency)
+
+        Yields:
+            dict: {"index", "status", "result", "duration"} per input text
+        """
+        return self._run_many(lambda text: self.summarize(text, method, length), texts, max_concurrency)
+
+    def paraphrase_many(self, texts, num_return_sequences=3, max_concurrency=None):
+        """
+        Paraphrase an iterable of texts concurrently.
+
+        Args:
+            texts: Iterable of input texts
+            num_return_sequences: Number of variations per text
+            max_concurrency: Maximum parallel calls (default: performance.batch.max_concurrency)
+
+        Yields:
+            dict: {"index", "status", "result", "duration"} per input text, in input order
+        """
+        # Batch items are one-off: the pool would request a full batch of variations per
+        # item (under the same max_tokens) and keep the unused ones for nothing
+        return self._run_many(
+            lambda text: self._paraphrase(text, num_return_sequences, pooled=False), texts, max_concurrency,
+        )
+
+    def _run_many(self, func, texts, max_concurrency=None):
+        """Run `func` over `texts` with a bounded in-flight window, yielding in order."""
+        limit = max(1, max_concurrency or self.batch_concurrency)
+        window = limit * 2
+        executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="textmorph-batch")
+        pending = deque()
+        try:
+            for index, text in enumerate(texts):
+                pending.append(executor.submit(self._timed_call, func, index, text))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Consumer may stop early: drop queued work instead of finishing it
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _timed_call(func, index, text):
+        start = time.perf_counter()
+        try:
+            result = func(text)
+            status = "error" if _is_error(result) else "success"
+        except Exception as e:
+            result, status = f"❌ Error: {e}", "error"
+        return {
+            "index": index,
+            "status": status,
+            "result": result,
+            "duration": time.perf_counter() - start,
+        }
+
     # -------- Utilities --------
+    def warm_up(self):
+        """Open pooled connections to the upstream APIs (and load local models) before the first request."""
+        components = [c for c in (self.extractive, self.abstractive, self.paraphraser) if c is not None]
+        urls = [c.api_url for c in components if getattr(c, "backend", "remote") != "local"]
+        results = self.transport.warm_up(dict.fromkeys(urls))
+        connected = sum(results.values())
+        print(f"🔌 Warmed up {connected}/{len(results)} API connections")
+
+        if self.abstractive is not None and self.abstractive.engine is not None:
+            try:
+                self.abstractive.engine.load()
+                print(f"🧠 Loaded local model {self.abstractive.engine.model_name}")
+            except Exception as e:
+                print(f"⚠️ Warning: Local model failed to load: {e}")
+        return results
+
     def get_status(self):
         return {
             "extractive": self.extractive is not None,
             "abstractive": self.abstractive is not None,
             "groq_paraphraser": self.paraphraser is not None,
+            "http": self.transport.get_stats(),
+            "rate_limit": self.rate_limiter.get_state(),
+            "retries": {service: policy.get_stats() for service, policy in self.retry_policies.items()},
+            "cache": self.cache.get_stats() if self.cache else None,
+            "result_store": self.result_store.get_stats() if self.result_store else None,
+            "single_flight": self.single_flight.get_stats() if self.single_flight else None,
+            "hedging": self.hedger.get_stats() if self.hedger else None,
+            "micro_batch": self.hf_batcher.get_stats() if self.hf_batcher else None,
+            "paraphrase_pool": self.paraphraser.pool.get_stats() if self.paraphraser and self.paraphraser.pool else None,
+            "circuit_breakers": {name: breaker.get_state() for name, breaker in self.breakers.items()},
+            "config_reload": config.watcher.get_stats() if config.watcher else None,
+            "local_model": self.abstractive.engine.get_stats() if self.abstractive and self.abstractive.engine else None,
         }
\ No newline at end of file
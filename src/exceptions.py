@@ -108,14 +108,16 @@ class APITimeoutError(APIError):
 class ModelLoadingError(APIError):
     """Raised when AI model is loading or unavailable."""
     
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, estimated_time: float = None):
         """
         Initialize ModelLoadingError.
         
         Args:
             model_name: Name of the model being loaded
+            estimated_time: Seconds until the model is expected to be ready
         """
         self.model_name = model_name
+        self.estimated_time = estimated_time
         message = f"Model '{model_name}' is currently loading. Please try again in a few moments."
         super().__init__(message, status_code=503)
 
@@ -220,16 +222,19 @@ class PipelineError(TextMorphError):
 class RateLimitError(APIError):
     """Raised when API rate limit is exceeded."""
     
-    def __init__(self, service: str, retry_after: int = None):
+    def __init__(self, service: str, retry_after: int = None, client_side: bool = False):
         """
         Initialize RateLimitError.
         
         Args:
             service: The service name
             retry_after: Seconds to wait before retrying
+            client_side: True if our own rate limiter refused the call before
+                anything was sent (says nothing about the backend's health)
         """
         self.service = service
         self.retry_after = retry_after
+        self.client_side = client_side
         message = f"Rate limit exceeded for {service}"
         if retry_after:
             message += f". Please retry after {retry_after} seconds."
@@ -243,6 +248,24 @@ class NetworkError(TextMorphError):
         super().__init__(message)
 
 
+class CircuitOpenError(TextMorphError):
+    """Raised when a backend's circuit breaker is open and calls fail fast."""
+    
+    def __init__(self, backend: str, retry_after: float = None):
+        """
+        Initialize CircuitOpenError.
+        
+        Args:
+            backend: The backend whose breaker is open
+            retry_after: Seconds until the backend is probed again
+        """
+        self.backend = backend
+        self.retry_after = retry_after
+        message = f"The {backend} backend is temporarily unavailable"
+        details = f"Retry after: {retry_after:.0f}s" if retry_after is not None else None
+        super().__init__(message, details)
+
+
 class FileOperationError(TextMorphError):
     """Raised when file operations fail."""
     
@@ -282,6 +305,7 @@ ERROR_CODES = {
     PipelineError: "PIPELINE_ERROR",
     RateLimitError: "RATE_LIMIT_ERROR",
     NetworkError: "NETWORK_ERROR",
+    CircuitOpenError: "CIRCUIT_OPEN",
     FileOperationError: "FILE_ERROR",
     LoggingError: "LOGGING_ERROR",
 }
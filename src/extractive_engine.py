@@ -0,0 +1,211 @@
+"""
+Local Extractive Engine for Text Morph
+Ranks sentences with TF-IDF, TextRank and centroid scoring entirely on CPU
+"""
+
+import re
+from typing import Callable, Dict, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+# Sentence boundary: terminal punctuation (optionally followed by a closing
+# quote or bracket) and whitespace, followed by an uppercase letter, digit or quote.
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=["\'(\[]?[A-Z0-9])')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of non-empty sentences in original order
+    """
+    sentences = []
+    for block in re.split(r'\n\s*\n', text.strip()):
+        block = " ".join(block.split())
+        if not block:
+            continue
+        sentences.extend(s.strip() for s in _SENTENCE_BOUNDARY.split(block) if s.strip())
+    return sentences
+
+
+class LocalExtractiveEngine:
+    """Vectorized TextRank/centroid sentence ranker built on a TF-IDF matrix."""
+
+    def __init__(self, textrank_weight: float = 0.7, damping: float = 0.85,
+                 max_iterations: int = 50, tolerance: float = 1e-6):
+        """
+        Initialize the local extractive engine.
+
+        Args:
+            textrank_weight: Weight of the TextRank score (the rest goes to centroid similarity)
+            damping: TextRank damping factor
+            max_iterations: Maximum power-iteration steps
+            tolerance: L1 convergence threshold for power iteration
+        """
+        self.textrank_weight = textrank_weight
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def score_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Score sentences by salience.
+
+        Args:
+            sentences: Sentences to score
+
+        Returns:
+            Array of scores in [0, 1], one per sentence
+        """
+        n = len(sentences)
+        if n == 0:
+            return np.zeros(0)
+        if n == 1:
+            return np.ones(1)
+
+        try:
+            vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+            matrix = vectorizer.fit_transform(sentences)
+        except ValueError:
+            # Only stop words / no usable vocabulary: fall back to document order
+            return np.linspace(1.0, 0.0, n)
+
+        # Rows are L2-normalized by TfidfVectorizer, so X @ X.T is cosine similarity
+        similarity = (matrix @ matrix.T).toarray()
+        np.fill_diagonal(similarity, 0.0)
+
+        textrank = self._textrank(similarity)
+
+        centroid = np.asarray(matrix.mean(axis=0)).ravel()
+        norm = np.linalg.norm(centroid)
+        centroid_scores = matrix @ (centroid / norm) if norm > 0 else np.zeros(n)
+
+        return (self.textrank_weight * self._rescale(textrank)
+                + (1.0 - self.textrank_weight) * self._rescale(np.asarray(centroid_scores).ravel()))
+
+    def _textrank(self, similarity: np.ndarray) -> np.ndarray:
+        """Run PageRank power iteration over a sentence similarity matrix."""
+        n = similarity.shape[0]
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        # Dangling sentences (no overlap with anything) link uniformly
+        transition = np.divide(similarity, row_sums,
+                               out=np.full_like(similarity, 1.0 / n),
+                               where=row_sums > 0)
+
+        scores = np.full(n, 1.0 / n)
+        teleport = (1.0 - self.damping) / n
+        for _ in range(self.max_iterations):
+            updated = teleport + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                return updated
+            scores = updated
+        return scores
+
+    @staticmethod
+    def _rescale(values: np.ndarray) -> np.ndarray:
+        """Min-max rescale to [0, 1]."""
+        spread = values.max() - values.min()
+        if spread <= 0:
+            return np.ones_like(values)
+        return (values - values.min()) / spread
+
+    def summarize(self, text: str, max_sentences: int = 4, max_words: int = None) -> str:
+        """
+        Select the most salient sentences within a sentence and word budget.
+
+        Args:
+            text: Input text
+            max_sentences: Maximum number of sentences to keep
+            max_words: Optional word budget for the summary
+
+        Returns:
+            Selected sentences joined in their original order
+        """
+        sentences = split_sentences(text)
+        if len(sentences) <= 1:
+            return " ".join(sentences)
+
+        selected = self.select(sentences, max_sentences, max_words)
+        return " ".join(sentences[i] for i in selected)
+
+    def select(self, sentences: List[str], max_sentences: int, max_words: int = None) -> List[int]:
+        """
+        Pick sentence indices by descending score under the given budgets.
+
+        Args:
+            sentences: Candidate sentences
+            max_sentences: Maximum number of sentences to keep
+            max_words: Optional word budget
+
+        Returns:
+            Sorted indices of the selected sentences
+        """
+        scores = self.score_sentences(sentences)
+        ranked = np.argsort(-scores, kind='stable')
+
+        selected = []
+        words_used = 0
+        for index in ranked:
+            if len(selected) >= max_sentences:
+                break
+            words = len(sentences[index].split())
+            # Always keep at least the top sentence, even if it alone exceeds the budget
+            if max_words and selected and words_used + words > max_words:
+                continue
+            selected.append(int(index))
+            words_used += words
+
+        return sorted(selected)
+
+    def condense(self, text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+        """
+        Keep the most salient sentences that fit a token budget.
+
+        Used to shrink long inputs before they are sent to an abstractive
+        model, so unlike summarize() there is no sentence limit.
+
+        Args:
+            text: Input text
+            max_tokens: Token budget for the condensed text
+            count_tokens: Token counter for a sentence
+
+        Returns:
+            Selected sentences joined in their original order
+        """
+        sentences = split_sentences(text)
+        if len(sentences) <= 1:
+            return " ".join(sentences)
+
+        ranked = np.argsort(-self.score_sentences(sentences), kind='stable')
+        selected = []
+        tokens_used = 0
+        for index in ranked:
+            tokens = count_tokens(sentences[index])
+            # Always keep at least the top sentence, even if it alone exceeds the budget
+            if selected and tokens_used + tokens > max_tokens:
+                continue
+            selected.append(int(index))
+            tokens_used += tokens
+
+        return " ".join(sentences[i] for i in sorted(selected))
+
+    @classmethod
+    def from_config(cls, params: Dict) -> "LocalExtractiveEngine":
+        """
+        Build an engine from the `summarization.extractive.local` config section.
+
+        Args:
+            params: Config dictionary (missing keys fall back to defaults)
+        """
+        return cls(
+            textrank_weight=params.get('textrank_weight', 0.7),
+            damping=params.get('damping', 0.85),
+            max_iterations=params.get('max_iterations', 50),
+            tolerance=params.get('tolerance', 1e-6),
+        )
@@ -0,0 +1,259 @@
+"""
+Hedged Requests for Text Morph
+Sends a duplicate request when the first one is slower than the observed tail latency
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from configure.config_manager import config
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies per key (e.g. service and length bucket)."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, key: Hashable, latency: float) -> None:
+        with self._lock:
+            self._samples[key].append(latency)
+
+    def percentile(self, key: Hashable, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get the q-th percentile latency for a key.
+
+        Args:
+            key: Latency bucket
+            q: Percentile in [0, 100]
+            min_samples: Minimum samples required
+
+        Returns:
+            Latency in seconds, or None with too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))
+        return samples[index]
+
+
+class Hedger:
+    """Hedges slow calls with a duplicate once they exceed an adaptive threshold.
+
+    The threshold is the configured percentile of recent latencies for the
+    call's bucket (never lower than `min_delay`). Hedges are capped at
+    `max_hedge_rate` of all calls so quota usage grows by at most that
+    fraction. Whichever attempt succeeds first wins; the other is cancelled.
+    In the sync path a loser that already started cannot be interrupted, so
+    its result is discarded when it completes.
+
+    Sync calls that cannot be hedged (too few samples, hedge budget used up,
+    or all hedging workers busy) run inline on the caller's thread; only
+    hedge candidates are handed to the worker pool.
+    """
+
+    def __init__(self, percentile: float = 95, max_hedge_rate: float = 0.1, min_samples: int = 20,
+                 min_delay: float = 0.5, window: int = 200, max_workers: int = 32):
+        """
+        Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile used as the hedge threshold
+            max_hedge_rate: Maximum fraction of calls that may be hedged
+            min_samples: Samples needed in a bucket before hedging starts
+            min_delay: Lower bound on the hedge threshold in seconds
+            window: Recent latencies kept per bucket
+            max_workers: Threads available to sync hedge candidates and their hedges;
+                beyond that, calls run unhedged on the caller's thread
+        """
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="textmorph-hedge")
+        self._lock = threading.Lock()
+        self._busy = 0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.cancelled = 0
+
+    def threshold(self, key: Hashable) -> Optional[float]:
+        """Current hedge delay for a bucket, or None while it has too few samples."""
+        latency = self.latencies.percentile(key, self.percentile, self.min_samples)
+        if latency is None:
+            return None
+        return max(self.min_delay, latency)
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_hedge_rate * self.calls:
+                return False
+            self.hedged += 1
+            return True
+
+    def _hedge_possible(self) -> bool:
+        """Whether the hedge budget would allow one more hedge right now (nothing is reserved)."""
+        with self._lock:
+            return self.hedged + 1 <= self.max_hedge_rate * self.calls
+
+    def _reserve_worker(self) -> bool:
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _pooled(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        try:
+            return self._timed(key, fn)
+        finally:
+            self._release_worker()
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def _timed(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        started = time.monotonic()
+        result = fn()
+        self.latencies.record(key, time.monotonic() - started)
+        return result
+
+    def call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn`, hedging it with a second call if it is slow.
+
+        Args:
+            key: Latency bucket, e.g. ('huggingface', 'abstractive', 'medium')
+            fn: Zero-argument function performing the request
+
+        Returns:
+            Result of the first attempt to succeed
+        """
+        self._count_call()
+        delay = self.threshold(key)
+        # Only a call that could still be hedged leaves the caller's thread
+        if delay is None or not self._hedge_possible() or not self._reserve_worker():
+            return self._timed(key, fn)
+        primary = self._executor.submit(self._pooled, key, fn)
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_worker():
+            return primary.result()
+        if not self._allow_hedge():
+            self._release_worker()
+            return primary.result()
+
+        hedge = self._executor.submit(self._pooled, key, fn)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        if loser.cancel():
+                            # Never started, so it will not release its worker itself
+                            self._release_worker()
+                            with self._lock:
+                                self.cancelled += 1
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def call_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()`, hedging it with a second call if it is slow; the loser task is cancelled.
+
+        Args:
+            key: Latency bucket
+            fn: Zero-argument coroutine function performing the request
+
+        Returns:
+            Result of the first attempt to succeed
+        """
+        async def timed():
+            started = time.monotonic()
+            result = await fn()
+            self.latencies.record(key, time.monotonic() - started)
+            return result
+
+        self._count_call()
+        delay = self.threshold(key)
+        primary = asyncio.ensure_future(timed())
+        if delay is None:
+            return await primary
+
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._allow_hedge():
+                return await primary
+
+            hedge = asyncio.ensure_future(timed())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        with self._lock:
+                            for loser in pending:
+                                loser.cancel()
+                                self.cancelled += 1
+                            if task is hedge:
+                                self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging counters.
+
+        Returns:
+            Dictionary with call, hedge, win and cancellation counts
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / self.calls, 3) if self.calls else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "cancelled": self.cancelled,
+            }
+
+    @classmethod
+    def from_config(cls) -> "Hedger":
+        """Build a hedger from `performance.hedging` in config.yaml."""
+        hedge_config = config.get('performance.hedging', {})
+        return cls(
+            percentile=hedge_config.get('percentile', 95),
+            max_hedge_rate=hedge_config.get('max_hedge_rate', 0.1),
+            min_samples=hedge_config.get('min_samples', 20),
+            min_delay=hedge_config.get('min_delay', 0.5),
+            window=hedge_config.get('window', 200),
+        )
@@ -0,0 +1,150 @@
+"""
+HTTP Transport for Text Morph
+Provides one pooled, keep-alive requests.Session shared by all API clients
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from configure.config_manager import config
+
+
+class HTTPTransport:
+    """Pooled HTTP session with per-host connection pools and reuse counters."""
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum keep-alive connections per host
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self.session = requests.Session()
+        self._mount_adapter()
+
+    def _mount_adapter(self) -> None:
+        self.adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def resize(self, pool_connections: int, pool_maxsize: int) -> None:
+        """
+        Change the pool sizes by mounting a new adapter.
+
+        Requests already in flight finish on the old adapter's connections,
+        which are released once it is garbage collected.
+
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum keep-alive connections per host
+        """
+        if (pool_connections, pool_maxsize) == (self.pool_connections, self.pool_maxsize):
+            return
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._mount_adapter()
+
+    def post(self, url: str, headers: Optional[Dict[str, str]] = None,
+             json: Any = None, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a POST request over a pooled connection.
+
+        Args:
+            url: Request URL
+            headers: Request headers
+            json: JSON payload
+            timeout: Timeout in seconds
+
+        Returns:
+            requests.Response
+        """
+        with self._lock:
+            self._requests += 1
+        try:
+            return self.session.post(url, headers=headers, json=json, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+
+    def warm_up(self, urls: Iterable[str], timeout: float = 5) -> Dict[str, bool]:
+        """
+        Open connections ahead of the first real request.
+
+        Args:
+            urls: URLs whose hosts should be connected
+            timeout: Timeout per warm-up request in seconds
+
+        Returns:
+            Mapping of URL to whether the connection was established
+        """
+        results = {}
+        for url in urls:
+            try:
+                self.session.head(url, timeout=timeout)
+                results[url] = True
+            except requests.exceptions.RequestException:
+                results[url] = False
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get connection reuse counters.
+
+        Returns:
+            Dictionary with request, connection and reuse counts
+        """
+        pools = self.adapter.poolmanager.pools
+        opened = 0
+        pool_requests = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            pool_requests += pool.num_requests
+
+        return {
+            "requests": self._requests,
+            "errors": self._errors,
+            "hosts": len(pools),
+            "connections_opened": opened,
+            "connections_reused": max(pool_requests - opened, 0),
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """
+    Get the process-wide shared transport, creating it from config.yaml on first use.
+
+    Returns:
+        Shared HTTPTransport instance
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport(
+                    pool_connections=config.get('http.pool_connections', 10),
+                    pool_maxsize=config.get('http.pool_maxsize', 10),
+                )
+    return _transport
@@ -0,0 +1,241 @@
+"""
+Local Inference for Text Morph
+Runs a seq2seq summarization model in-process on CPU, batching concurrent requests
+"""
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from batching import DynamicBatcher
+from exceptions import ConfigurationError, SummarizationError
+
+
+# Keys from get_parameters() that describe the backend rather than generation
+_NON_GENERATION_KEYS = ("backend", "model", "mode")
+
+MODES = ("fp32", "int8", "onnx")
+
+
+def import_torch():
+    """
+    Import torch and transformers on demand.
+
+    They are heavy and only needed for the local backends, so nothing imports
+    them at module load time.
+
+    Returns:
+        tuple: (torch, transformers)
+
+    Raises:
+        SummarizationError: If either package is missing
+    """
+    try:
+        import torch
+        import transformers
+    except ImportError as e:
+        raise SummarizationError(
+            f"Local inference requires torch and transformers ({e}). "
+            "Install them with: pip install torch transformers",
+            method="abstractive",
+        ) from e
+    return torch, transformers
+
+
+def import_ort_model():
+    """
+    Import the ONNX Runtime seq2seq wrapper from optimum on demand.
+
+    Returns:
+        ORTModelForSeq2SeqLM class
+
+    Raises:
+        SummarizationError: If optimum[onnxruntime] is missing
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise SummarizationError(
+            f"ONNX mode requires optimum and onnxruntime ({e}). "
+            "Install them with: pip install optimum[onnxruntime]",
+            method="abstractive",
+        ) from e
+    return ORTModelForSeq2SeqLM
+
+
+def artifact_path(model_name: str, mode: str, model_dir: str = "models") -> str:
+    """
+    Where the prepared model for a mode is stored.
+
+    Args:
+        model_name: Hugging Face model id
+        mode: 'int8' or 'onnx'
+        model_dir: Directory holding prepared models
+
+    Returns:
+        File path (int8) or directory path (onnx)
+    """
+    slug = model_name.replace("/", "--")
+    if mode == "int8":
+        return os.path.join(model_dir, f"{slug}-int8.pt")
+    return os.path.join(model_dir, f"{slug}-onnx")
+
+
+def quantize_int8(torch, model):
+    """Dynamically quantize a model's Linear layers to int8 (weights int8, activations quantized per batch)."""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class LocalSeq2SeqEngine:
+    """A resident seq2seq model (e.g. BART) served through a DynamicBatcher.
+
+    The model is loaded on the first batch (or by load()) and stays in memory
+    for the life of the process. Inputs in a batch are padded to the longest
+    one and truncated to `max_input_tokens`.
+
+    Modes:
+        fp32: the model as published
+        int8: Linear layers dynamically quantized to int8 (about 4x smaller weights)
+        onnx: ONNX Runtime graphs (encoder, decoder and decoder-with-past, so
+            the encoder output and past key/values are reused while decoding)
+
+    int8 and onnx load the artifacts written by `python src/model_export.py`
+    when present, and otherwise convert at load time.
+    """
+
+    def __init__(self, model_name: str = "facebook/bart-large-cnn", num_threads: Optional[int] = None,
+                 max_batch_size: int = 8, max_wait: float = 0.02, max_input_tokens: int = 1024,
+                 mode: str = "fp32", model_dir: str = "models"):
+        """
+        Initialize the engine.
+
+        Args:
+            model_name: Hugging Face model id or local path
+            num_threads: torch intra-op threads (process-wide; None keeps torch's default)
+            max_batch_size: Largest batch passed to model.generate()
+            max_wait: Seconds the batcher waits for more requests
+            max_input_tokens: Input truncation length
+            mode: 'fp32', 'int8' or 'onnx'
+            model_dir: Directory holding prepared int8/onnx models
+        """
+        if mode not in MODES:
+            raise ConfigurationError(f"Unknown local model mode '{mode}' (expected one of {', '.join(MODES)})",
+                                     config_key="summarization.abstractive.local.mode")
+        self.model_name = model_name
+        self.mode = mode
+        self.model_dir = model_dir
+        self.num_threads = num_threads
+        self.max_input_tokens = max_input_tokens
+        self.model = None
+        self.tokenizer = None
+        self._load_lock = threading.Lock()
+        self.batcher = DynamicBatcher(self._generate_batch, max_batch_size=max_batch_size, max_wait=max_wait,
+                                      name="textmorph-local-model")
+
+    def load(self) -> None:
+        """Load the tokenizer and model if they are not resident yet."""
+        with self._load_lock:
+            if self.model is not None:
+                return
+            torch, transformers = import_torch()
+            if self.num_threads:
+                torch.set_num_threads(self.num_threads)
+            self.tokenizer = transformers.AutoTokenizer.from_pretrained(self.model_name)
+            model = self._load_model(torch, transformers)
+            if hasattr(model, "eval"):
+                model.eval()
+            self.model = model
+
+    def _load_model(self, torch, transformers):
+        if self.mode == "onnx":
+            ort_model = import_ort_model()
+            path = artifact_path(self.model_name, "onnx", self.model_dir)
+            if os.path.isdir(path):
+                return ort_model.from_pretrained(path, use_cache=True)
+            return ort_model.from_pretrained(self.model_name, export=True, use_cache=True)
+
+        if self.mode == "int8":
+            path = artifact_path(self.model_name, "int8", self.model_dir)
+            if os.path.exists(path):
+                return torch.load(path, weights_only=False)
+            return quantize_int8(torch, transformers.AutoModelForSeq2SeqLM.from_pretrained(self.model_name))
+
+        return transformers.AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+
+    def _generate_batch(self, group: Tuple, texts: List[str]) -> List[str]:
+        torch, _ = import_torch()
+        self.load()
+        inputs = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_input_tokens,
+                                return_tensors="pt")
+        with torch.inference_mode():
+            output = self.model.generate(**inputs, **dict(group))
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)
+
+    @staticmethod
+    def _group(params: Dict[str, Any]) -> Tuple:
+        """Hashable generation parameters; requests batch together only when they match."""
+        return tuple(sorted((k, v) for k, v in params.items() if k not in _NON_GENERATION_KEYS))
+
+    def submit(self, text: str, params: Dict[str, Any]) -> Future:
+        """
+        Queue a text for summarization.
+
+        Args:
+            text: Input text
+            params: Generation parameters (max_length, min_length, num_beams, ...)
+
+        Returns:
+            Future resolving to the summary
+        """
+        return self.batcher.submit(text, group=self._group(params))
+
+    def summarize(self, text: str, params: Dict[str, Any]) -> str:
+        """Summarize a text, blocking until its batch has run."""
+        return self.submit(text, params).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine state.
+
+        Returns:
+            Dictionary with model name, load state and batching counters
+        """
+        return {
+            "model": self.model_name,
+            "mode": self.mode,
+            "loaded": self.model is not None,
+            **self.batcher.get_stats(),
+        }
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_local_engine(local_config: Dict[str, Any]) -> LocalSeq2SeqEngine:
+    """
+    Get the process-wide engine for a model, creating it on first use.
+
+    Args:
+        local_config: The `summarization.abstractive.local` section of config.yaml
+
+    Returns:
+        Shared LocalSeq2SeqEngine (the model is loaded once per process and mode)
+    """
+    model_name = local_config.get('model', 'facebook/bart-large-cnn')
+    mode = local_config.get('mode', 'fp32')
+    with _engines_lock:
+        engine = _engines.get((model_name, mode))
+        if engine is None:
+            engine = LocalSeq2SeqEngine(
+                model_name=model_name,
+                num_threads=local_config.get('num_threads'),
+                max_batch_size=local_config.get('max_batch_size', 8),
+                max_wait=local_config.get('max_wait_ms', 20) / 1000,
+                max_input_tokens=local_config.get('max_input_tokens', 1024),
+                mode=mode,
+                model_dir=local_config.get('model_dir', 'models'),
+            )
+            _engines[(model_name, mode)] = engine
+        return engine
@@ -0,0 +1,328 @@
+"""
+Log Reader for Text Morph
+Tails and searches the rotating log files without loading them into memory
+"""
+
+import json
+import logging
+import os
+import re
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_DIRECTIVES = {
+    'Y': r'\d{4}', 'y': r'\d{2}', 'm': r'\d{2}', 'd': r'\d{2}', 'H': r'\d{2}', 'I': r'\d{2}',
+    'M': r'\d{2}', 'S': r'\d{2}', 'f': r'\d{1,6}', 'p': r'[AP]M', 'j': r'\d{3}', '%': '%',
+}
+_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+_FIELDS = re.compile(r' - (?P<logger>[\w.]+) - (?P<level>' + '|'.join(_LEVELS) + r') - ')
+
+
+def _timestamp_pattern(date_format: str) -> re.Pattern:
+    """Regex matching a timestamp written with a strftime format at the start of a line."""
+    parts = re.split(r'%(.)', date_format)
+    pattern = ''.join(
+        _DIRECTIVES.get(part, r'\S+') if i % 2 else re.escape(part) for i, part in enumerate(parts)
+    )
+    return re.compile(('^(' + pattern + ')').encode())
+
+
+def log_files(log_file: Path, backup_count: int) -> List[Path]:
+    """
+    List a log file and its rotated backups that exist, newest first.
+
+    Args:
+        log_file: Active log file (e.g. logs/text_morph.log)
+        backup_count: Number of rotated backups kept (text_morph.log.1..N)
+
+    Returns:
+        Existing paths: the active file, then .1, .2, ...
+    """
+    paths = [Path(log_file)] + [Path(f"{log_file}.{i}") for i in range(1, backup_count + 1)]
+    return [path for path in paths if path.exists()]
+
+
+def reverse_lines(path: Path, block_size: int = 65536) -> Iterator[bytes]:
+    """
+    Yield the lines of a file from last to first, reading fixed-size blocks from the end.
+
+    Args:
+        path: File to read
+        block_size: Bytes read per seek
+
+    Yields:
+        Lines without their trailing newline, newest first
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        at_end = True
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b'\n')
+            # The first piece may be the tail of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            if at_end and lines and lines[-1] == b'':
+                lines.pop()
+            at_end = at_end and not lines
+            yield from reversed(lines)
+        if remainder:
+            yield remainder
+
+
+def tail_lines(paths: List[Path], count: int, block_size: int = 65536) -> List[str]:
+    """
+    Get the last lines across a log file and its backups.
+
+    Only the blocks holding those lines are read, continuing into older
+    backups when the active file has fewer than `count` lines.
+
+    Args:
+        paths: Files newest first (see log_files())
+        count: Number of lines
+        block_size: Bytes read per seek
+
+    Returns:
+        Up to `count` lines in chronological order, each ending in a newline
+    """
+    collected = []
+    for path in paths:
+        for line in reverse_lines(path, block_size):
+            if len(collected) >= count:
+                break
+            collected.append(line.decode('utf-8', errors='replace') + '\n')
+        if len(collected) >= count:
+            break
+    collected.reverse()
+    return collected
+
+
+class LogIndex:
+    """Sparse sidecar index of one log file: record offsets with their timestamps.
+
+    One entry is kept roughly every `stride` bytes, so a time-range search
+    can seek near its start instead of scanning the file. The index is stored
+    next to the log as `<file>.idx`, extended incrementally as the file grows,
+    and rebuilt when the file was rotated away or truncated.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, date_format: str = '%Y-%m-%d %H:%M:%S', stride: int = 65536):
+        """
+        Initialize the index (call refresh() to load or build it).
+
+        Args:
+            path: Log file
+            date_format: strftime format of record timestamps
+            stride: Approximate bytes between index entries
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + '.idx')
+        self.date_format = date_format
+        self.stride = stride
+        self.pattern = _timestamp_pattern(date_format)
+        self._reset()
+
+    def _reset(self, identity: Optional[List] = None) -> None:
+        self.identity = identity
+        self.entries: List[Tuple[int, str]] = []
+        self.indexed_size = 0
+        self.first = None
+        self.last = None
+
+    def _identity(self) -> Optional[List]:
+        """Inode plus the first line, so a rotated or rewritten file is not mistaken for the old one."""
+        try:
+            stat = self.path.stat()
+            with open(self.path, 'rb') as f:
+                head = f.readline(256)
+        except OSError:
+            return None
+        return [stat.st_ino, head.decode('utf-8', errors='replace')]
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.VERSION or data.get('date_format') != self.date_format:
+            return
+        self.identity = data.get('identity')
+        self.entries = [tuple(entry) for entry in data.get('entries', [])]
+        self.indexed_size = data.get('indexed_size', 0)
+        self.first = data.get('first')
+        self.last = data.get('last')
+
+    def _save(self) -> None:
+        data = {
+            'version': self.VERSION,
+            'date_format': self.date_format,
+            'identity': self.identity,
+            'indexed_size': self.indexed_size,
+            'first': self.first,
+            'last': self.last,
+            'entries': self.entries,
+        }
+        temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        try:
+            temp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # The index only speeds up searches; a read-only log directory is fine
+            pass
+
+    def refresh(self) -> "LogIndex":
+        """
+        Load the sidecar and index any part of the file written since.
+
+        Returns:
+            self
+        """
+        self._load()
+        identity = self._identity()
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        if identity != self.identity or size < self.indexed_size:
+            self._reset(identity)
+        if size > self.indexed_size:
+            self._extend()
+            self._save()
+        return self
+
+    def _extend(self) -> None:
+        next_mark = self.entries[-1][0] + self.stride if self.entries else 0
+        with open(self.path, 'rb') as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Line still being written; index it next time
+                    break
+                match = self.pattern.match(line)
+                if match:
+                    timestamp = match.group(1).decode()
+                    if offset >= next_mark:
+                        self.entries.append((offset, timestamp))
+                        next_mark = offset + self.stride
+                    if self.first is None:
+                        self.first = timestamp
+                    self.last = timestamp
+                offset += len(line)
+        self.indexed_size = offset
+
+    def parse(self, timestamp: str) -> datetime:
+        return datetime.strptime(timestamp, self.date_format)
+
+    def start_offset(self, since: Optional[datetime]) -> int:
+        """
+        Offset from which all records at or after `since` are found.
+
+        Args:
+            since: Earliest timestamp of interest (None for the start of the file)
+
+        Returns:
+            Byte offset of a record boundary
+        """
+        if since is None or not self.entries:
+            return 0
+        times = [self.parse(timestamp) for _, timestamp in self.entries]
+        # Records with equal timestamps may precede the matching entry, so step back one
+        position = bisect_right(times, since) - 1
+        while position > 0 and times[position] >= since:
+            position -= 1
+        return self.entries[position][0] if position >= 0 else 0
+
+
+def _records(path: Path, start: int, timestamp: re.Pattern) -> Iterator[Tuple[int, str, str]]:
+    """Yield (offset, timestamp, text) per record, joining continuation lines (e.g. tracebacks)."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        current = None
+        for line in f:
+            match = timestamp.match(line)
+            if match:
+                if current is not None:
+                    yield current[0], current[1], b''.join(current[2]).decode('utf-8', errors='replace')
+                current = (offset, match.group(1).decode(), [line])
+            elif current is not None:
+                current[2].append(line)
+            offset += len(line)
+        if current is not None:
+            yield current[0], current[1], b''.join(current[2]).decode('utf-8', errors='replace')
+
+
+def search_logs(paths: List[Path], level: Optional[str] = None, since: Optional[datetime] = None,
+                until: Optional[datetime] = None, service: Optional[str] = None,
+                contains: Optional[str] = None, date_format: str = '%Y-%m-%d %H:%M:%S',
+                stride: int = 65536) -> Iterator[Dict[str, Any]]:
+    """
+    Stream log records matching all given filters, oldest first.
+
+    Files entirely outside the time range are skipped using their index, and
+    each remaining file is read from the indexed offset nearest `since`.
+
+    Args:
+        paths: Files newest first (see log_files())
+        level: Minimum level ('DEBUG' ... 'CRITICAL')
+        since: Earliest timestamp (inclusive)
+        until: Latest timestamp (inclusive)
+        service: Upstream service (as in "API Call - <service> |") or child logger name
+        contains: Case-insensitive substring of the record text
+        date_format: strftime format of record timestamps
+        stride: Approximate bytes between index entries
+
+    Yields:
+        dict: {"timestamp", "level", "logger", "message", "file", "offset"}
+
+    Raises:
+        ValueError: If `level` is not a logging level name
+    """
+    if level and level.upper() not in _LEVELS:
+        raise ValueError(f"Unknown log level: {level}")
+    min_level = logging.getLevelName(level.upper()) if level else None
+    service = service.lower() if service else None
+    contains = contains.lower() if contains else None
+
+    for path in reversed(paths):
+        index = LogIndex(path, date_format, stride).refresh()
+        if index.last is None:
+            continue
+        if since is not None and index.parse(index.last) < since:
+            continue
+        if until is not None and index.parse(index.first) > until:
+            return
+
+        for offset, timestamp, text in _records(path, index.start_offset(since), index.pattern):
+            when = index.parse(timestamp)
+            if since is not None and when < since:
+                continue
+            if until is not None and when > until:
+                return
+            fields = _FIELDS.search(text)
+            record_level = fields.group('level') if fields else None
+            logger_name = fields.group('logger') if fields else ''
+            message = text[fields.end():].rstrip('\n') if fields else text.rstrip('\n')
+            if min_level is not None and (record_level is None or logging.getLevelName(record_level) < min_level):
+                continue
+            if service is not None and service not in logger_name.lower().split('.') \
+                    and not message.lower().startswith(f"api call - {service} |"):
+                continue
+            if contains is not None and contains not in text.lower():
+                continue
+            yield {
+                "timestamp": when,
+                "level": record_level,
+                "logger": logger_name,
+                "message": message,
+                "file": str(path),
+                "offset": offset,
+            }
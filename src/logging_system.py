@@ -3,14 +3,19 @@ Logging System for Text Morph
 Configures and provides centralized logging functionality
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Iterator, List, Optional
 from datetime import datetime
 from configure.config_manager import config
 from exceptions import LoggingError
+from log_reader import log_files, search_logs, tail_lines
+from metrics import operation_latency
 
 
 class ColoredFormatter(logging.Formatter):
@@ -26,9 +31,21 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, colored: Optional[bool] = None):
+        """
+        Initialize the formatter.
+        
+        Args:
+            fmt: Log format string
+            datefmt: Date format string
+            colored: Whether to colorize level names (default: logging.console.colored)
+        """
+        super().__init__(fmt, datefmt=datefmt)
+        self.colored = config.get_bool('logging.console.colored', True) if colored is None else colored
+    
     def format(self, record):
         """Format log record with colors."""
-        if config.get('logging.console.colored', True):
+        if self.colored:
             levelname = record.levelname
             if levelname in self.COLORS:
                 record.levelname = (
@@ -37,11 +54,117 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler for a bounded queue that never stalls the caller indefinitely.
+    
+    Overflow policies when the queue is full:
+        block: wait up to `block_timeout` seconds for room (None waits forever), then drop the record
+        drop_oldest: discard the oldest queued record to make room
+        sample: like drop_oldest, but once the queue is `sample_threshold` full only every
+            `sample_rate`-th record below WARNING is queued
+    """
+    
+    POLICIES = ('block', 'drop_oldest', 'sample')
+    
+    def __init__(self, log_queue: queue.Queue, overflow: str = 'drop_oldest', block_timeout: Optional[float] = None,
+                 sample_rate: int = 10, sample_threshold: float = 0.8):
+        """
+        Initialize the handler.
+        
+        Args:
+            log_queue: Bounded queue shared with the listener
+            overflow: 'block', 'drop_oldest' or 'sample'
+            block_timeout: Seconds to wait for room under the block policy
+            sample_rate: Keep one in this many low-priority records while sampling
+            sample_threshold: Queue fill ratio at which sampling starts
+        """
+        super().__init__(log_queue)
+        if overflow not in self.POLICIES:
+            raise LoggingError(f"Unknown log queue overflow policy: {overflow}")
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.sample_rate = max(1, sample_rate)
+        self.sample_threshold = sample_threshold
+        self._counter_lock = threading.Lock()
+        self._sample_count = 0
+        self.enqueued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record according to the overflow policy."""
+        if self.overflow == 'block':
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self._count('dropped')
+                return
+            self._count('enqueued')
+            return
+        
+        if self.overflow == 'sample' and record.levelno < logging.WARNING and self._sampling():
+            with self._counter_lock:
+                self._sample_count += 1
+                keep = self._sample_count % self.sample_rate == 0
+            if not keep:
+                self._count('sampled_out')
+                return
+        
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self._count('dropped')
+                except queue.Empty:
+                    pass
+        self._count('enqueued')
+    
+    def _sampling(self) -> bool:
+        return self.queue.qsize() >= self.sample_threshold * self.queue.maxsize
+    
+    def _count(self, counter: str) -> None:
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def get_stats(self) -> dict:
+        """
+        Get queue counters.
+        
+        Returns:
+            Dictionary with policy, capacity, current depth and enqueued/dropped/sampled-out counts
+        """
+        with self._counter_lock:
+            return {
+                "overflow": self.overflow,
+                "capacity": self.queue.maxsize,
+                "depth": self.queue.qsize(),
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "sampled_out": self.sampled_out,
+            }
+
+
+class _DrainingQueueListener(QueueListener):
+    """Queue listener whose stop sentinel waits for room, so a full queue is drained rather than lost."""
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
 class LoggingSystem:
     """Manages application-wide logging configuration."""
     
     _instance = None
     _logger = None
+    _handlers = []
+    _queue_handler = None
+    _listener = None
+    _date_format = '%Y-%m-%d %H:%M:%S'
+    _index_stride = 65536
     
     def __new__(cls):
         """Singleton pattern for logging system."""
@@ -69,7 +192,9 @@ class LoggingSystem:
             self._logger.setLevel(level)
             
             # Remove existing handlers
+            self.shutdown()
             self._logger.handlers.clear()
+            self._handlers = []
             
             # Set up file logging
             if log_config.get('file', {}).get('enabled', True):
@@ -79,6 +204,13 @@ class LoggingSystem:
             if log_config.get('console', {}).get('enabled', True):
                 self._setup_console_handler(log_config)
             
+            # Hand records to a background listener, or write them on the calling thread
+            if log_config.get('async', {}).get('enabled', False):
+                self._setup_queue(log_config.get('async', {}))
+            else:
+                for handler in self._handlers:
+                    self._logger.addHandler(handler)
+            
             # Prevent propagation to root logger
             self._logger.propagate = False
             
@@ -125,8 +257,9 @@ class LoggingSystem:
             formatter = logging.Formatter(log_format, datefmt=date_format)
             file_handler.setFormatter(formatter)
             
-            # Add handler to logger
-            self._logger.addHandler(file_handler)
+            self._handlers.append(file_handler)
+            self._date_format = date_format
+            self._index_stride = file_config.get('index_stride', 65536)
             
         except Exception as e:
             print(f"Warning: Failed to set up file logging: {e}", file=sys.stderr)
@@ -154,12 +287,62 @@ class LoggingSystem:
             
             console_handler.setFormatter(formatter)
             
-            # Add handler to logger
-            self._logger.addHandler(console_handler)
+            self._handlers.append(console_handler)
             
         except Exception as e:
             print(f"Warning: Failed to set up console logging: {e}", file=sys.stderr)
     
+    def _setup_queue(self, async_config: dict) -> None:
+        """
+        Route records through a bounded in-memory queue to a background listener.
+        
+        The listener thread owns the file and console handlers, so file I/O and
+        rotation never happen on the request thread.
+        
+        Args:
+            async_config: `logging.async` configuration dictionary
+        """
+        log_queue = queue.Queue(maxsize=async_config.get('queue_size', 10000))
+        self._queue_handler = BoundedQueueHandler(
+            log_queue,
+            overflow=async_config.get('overflow', 'drop_oldest'),
+            block_timeout=async_config.get('block_timeout'),
+            sample_rate=async_config.get('sample_rate', 10),
+            sample_threshold=async_config.get('sample_threshold', 0.8),
+        )
+        self._listener = _DrainingQueueListener(log_queue, *self._handlers, respect_handler_level=True)
+        self._listener.start()
+        self._logger.addHandler(self._queue_handler)
+        atexit.unregister(self.shutdown)
+        atexit.register(self.shutdown)
+    
+    def shutdown(self) -> None:
+        """
+        Flush queued records and stop the background listener.
+        
+        Handlers are attached directly to the logger afterwards, so records
+        logged later (e.g. by other atexit hooks) are still written.
+        """
+        if self._listener is None:
+            return
+        self._logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        self._listener = None
+        for handler in self._handlers:
+            handler.flush()
+            self._logger.addHandler(handler)
+    
+    def get_queue_stats(self) -> Optional[dict]:
+        """
+        Get async logging counters.
+        
+        Returns:
+            Queue depth and enqueued/dropped/sampled-out counts, or None when async logging is off
+        """
+        if self._queue_handler is None:
+            return None
+        return {"running": self._listener is not None, **self._queue_handler.get_stats()}
+    
     @property
     def logger(self) -> logging.Logger:
         """Get the logger instance."""
@@ -250,6 +433,7 @@ class LoggingSystem:
         """
         detail_str = f" | {details}" if details else ""
         self._logger.info(f"Performance - {operation} | {duration:.2f}s{detail_str}")
+        operation_latency.labels(operation).observe(duration)
     
     def log_error_with_context(self, error: Exception, context: dict = None) -> None:
         """
@@ -281,6 +465,12 @@ class LoggingSystem:
         self._logger.setLevel(level_obj)
         self._logger.info(f"Logging level changed to {level.upper()}")
     
+    def _file_handler(self) -> Optional[RotatingFileHandler]:
+        for handler in self._handlers:
+            if isinstance(handler, RotatingFileHandler):
+                return handler
+        return None
+    
     def get_log_file_path(self) -> Optional[Path]:
         """
         Get the path to the log file.
@@ -288,10 +478,20 @@ class LoggingSystem:
         Returns:
             Path to log file or None if file logging disabled
         """
-        for handler in self._logger.handlers:
-            if isinstance(handler, RotatingFileHandler):
-                return Path(handler.baseFilename)
-        return None
+        handler = self._file_handler()
+        return Path(handler.baseFilename) if handler else None
+    
+    def get_log_files(self) -> List[Path]:
+        """
+        Get the log file and its rotated backups.
+        
+        Returns:
+            Existing files newest first (text_morph.log, text_morph.log.1, ...)
+        """
+        handler = self._file_handler()
+        if handler is None:
+            return []
+        return log_files(Path(handler.baseFilename), handler.backupCount)
     
     def clear_logs(self) -> None:
         """Clear all log files."""
@@ -307,23 +507,46 @@ class LoggingSystem:
         """
         Get recent log entries.
         
+        Only the end of the log is read, block by block from the end of the
+        file, continuing into rotated backups when needed.
+        
         Args:
             lines: Number of recent lines to retrieve
             
         Returns:
-            List of log lines
+            List of log lines, oldest first
         """
-        log_file = self.get_log_file_path()
-        if not log_file or not log_file.exists():
-            return []
-        
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                return all_lines[-lines:] if len(all_lines) > lines else all_lines
+            return tail_lines(self.get_log_files(), lines)
         except Exception as e:
             self._logger.error(f"Failed to read log file: {e}")
             return []
+    
+    def search_logs(self, level: Optional[str] = None, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None, service: Optional[str] = None,
+                    contains: Optional[str] = None) -> Iterator[dict]:
+        """
+        Stream log records matching all given filters, oldest first, across rotated files.
+        
+        A sidecar index next to each file (`<file>.idx`) lets time-range
+        searches seek close to `since` instead of reading whole files.
+        
+        Args:
+            level: Minimum level (e.g. 'WARNING' also matches ERROR and CRITICAL)
+            since: Earliest timestamp (inclusive)
+            until: Latest timestamp (inclusive)
+            service: Upstream service of API call records (e.g. 'groq') or child logger name
+            contains: Case-insensitive substring
+            
+        Returns:
+            Lazy iterator of {"timestamp", "level", "logger", "message", "file", "offset"} dicts
+            
+        Example:
+            for record in logging_system.search_logs(level='ERROR', service='groq'):
+                print(record['timestamp'], record['message'])
+        """
+        return search_logs(self.get_log_files(), level=level, since=since, until=until, service=service,
+                           contains=contains, date_format=self._date_format, stride=self._index_stride)
 
 
 # Create global logging system instance
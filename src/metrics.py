@@ -0,0 +1,461 @@
+"""
+Metrics for Text Morph
+In-process counters, gauges and latency histograms with a Prometheus text endpoint
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from configure.config_manager import config
+from exceptions import get_error_code
+
+
+# Upper bounds in seconds; cover local extractive calls (ms) up to slow cold-start model calls
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class _HistogramChild:
+    __slots__ = ('_lock', 'bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Metric(ABC):
+    """A named metric family; `labels()` returns the child for one label combination."""
+
+    type_name = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name (e.g. 'textmorph_upstream_requests_total')
+            documentation: Help text shown in the exposition output
+            labelnames: Label names, in order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child holding the values of one label combination."""
+
+    def labels(self, *values, **kwargs):
+        """
+        Get the child for a label combination, creating it on first use.
+
+        Args:
+            *values: Label values in `labelnames` order
+            **kwargs: Label values by name
+
+        Returns:
+            Child with inc()/set()/observe() depending on the metric type
+        """
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _matching(self, filters: Dict[str, Any]) -> Iterator[object]:
+        """Children whose labels match; a filter value may be one label value or a tuple of accepted values."""
+        positions = {}
+        for name, value in filters.items():
+            accepted = value if isinstance(value, (tuple, list, set)) else (value,)
+            positions[self.labelnames.index(name)] = {str(v) for v in accepted}
+        for values, child in self._items():
+            if all(values[i] in accepted for i, accepted in positions.items()):
+                yield child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in self._items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabeled counter."""
+        self.labels().inc(amount)
+
+    def total(self, **filters) -> float:
+        """Sum over all children whose labels match `filters`."""
+        return sum(child.value for child in self._matching(filters))
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabeled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed buckets."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            buckets: Sorted bucket upper bounds (+Inf is added automatically)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabeled histogram."""
+        self.labels().observe(value)
+
+    def snapshot(self, **filters) -> Tuple[List[int], float, int]:
+        """
+        Merge the children whose labels match `filters`.
+
+        Returns:
+            tuple: (per-bucket counts with +Inf last, sum, count)
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        total, count = 0.0, 0
+        for child in self._matching(filters):
+            with child._lock:
+                for i, value in enumerate(child.counts):
+                    counts[i] += value
+                total += child.sum
+                count += child.count
+        return counts, total, count
+
+    def quantile(self, q: float, **filters) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q: Quantile in [0, 1] (e.g. 0.95)
+            **filters: Label values to restrict to (e.g. service='groq')
+
+        Returns:
+            Estimated value in seconds, or None without observations
+        """
+        counts, _, count = self.snapshot(**filters)
+        if count == 0:
+            return None
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if i == len(self.buckets):
+                    # Above the largest bound there is nothing to interpolate against
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, child in self._items():
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, values, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metric families by name and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry and the metrics recorded for every upstream call
+registry = MetricsRegistry()
+
+# Services behind a network call; 'local' covers the on-host engines (including progressive drafts)
+REMOTE_SERVICES = ('huggingface', 'groq')
+
+UPSTREAM_LABELS = ('service', 'method', 'length', 'outcome')
+upstream_requests = registry.counter(
+    'textmorph_upstream_requests_total', 'Upstream model calls.', UPSTREAM_LABELS)
+upstream_latency = registry.histogram(
+    'textmorph_upstream_request_duration_seconds', 'Upstream model call latency in seconds.', UPSTREAM_LABELS)
+upstream_in_flight = registry.gauge(
+    'textmorph_upstream_in_flight', 'Upstream model calls in progress.', ('service',))
+operation_latency = registry.histogram(
+    'textmorph_operation_duration_seconds', 'Duration of logged operations in seconds.', ('operation',))
+
+
+def record_upstream(service: str, method: str, length, outcome: str, duration: float) -> None:
+    """
+    Record one finished upstream call.
+
+    Args:
+        service: 'huggingface', 'groq' or 'local'
+        method: Pipeline method (e.g. 'abstractive', 'paraphrase')
+        length: Length bucket ('short', 'medium', 'long', or the number of variations)
+        outcome: 'success' or a lowercase error code (e.g. 'api_timeout', 'circuit_open')
+        duration: Seconds
+    """
+    upstream_requests.labels(service, method, length, outcome).inc()
+    upstream_latency.labels(service, method, length, outcome).observe(duration)
+
+
+@contextmanager
+def track_upstream(service: str, method: str, length) -> Iterator[None]:
+    """
+    Time the enclosed upstream call and record its outcome.
+
+    Works around `await` as well; exceptions are recorded with their error
+    code and re-raised.
+    """
+    in_flight = upstream_in_flight.labels(service)
+    in_flight.inc()
+    started = time.perf_counter()
+    outcome = 'success'
+    try:
+        yield
+    except BaseException as e:
+        outcome = get_error_code(e).lower() if isinstance(e, Exception) else 'cancelled'
+        raise
+    finally:
+        in_flight.dec()
+        record_upstream(service, method, length, outcome, time.perf_counter() - started)
+
+
+def latency_summary(**filters) -> Dict[str, Optional[float]]:
+    """
+    Get p50/p95 upstream latency and the call count.
+
+    Args:
+        **filters: Label values to restrict to (e.g. service='huggingface',
+            or service=REMOTE_SERVICES for all API calls)
+
+    Returns:
+        dict: {"p50", "p95", "count"}; quantiles are None before the first call
+    """
+    _, _, count = upstream_latency.snapshot(**filters)
+    return {
+        "p50": upstream_latency.quantile(0.5, **filters),
+        "p95": upstream_latency.quantile(0.95, **filters),
+        "count": count,
+    }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = registry
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes would otherwise print a line to stderr every few seconds
+        pass
+
+
+class MetricsServer:
+    """Serves the registry at http://<host>:<port>/metrics on a daemon thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9464):
+        """
+        Start the server.
+
+        Args:
+            host: Interface to bind (keep it local unless the port is firewalled)
+            port: TCP port (0 picks a free one)
+
+        Raises:
+            OSError: If the port is already in use
+        """
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="textmorph-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def close(self) -> None:
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server() -> Optional[MetricsServer]:
+    """
+    Start the process-wide metrics endpoint from `metrics.exporter` in config.yaml.
+
+    Returns:
+        The running server, or None if the exporter is disabled or the port is taken
+        (e.g. by another Streamlit worker on the same host)
+    """
+    global _server
+    if not config.get('metrics.exporter.enabled', False):
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = MetricsServer(
+                    host=config.get('metrics.exporter.host', '127.0.0.1'),
+                    port=config.get_int('metrics.exporter.port', 9464),
+                )
+                print(f"📈 Metrics served at {_server.url}")
+            except OSError as e:
+                print(f"⚠️ Warning: Metrics endpoint failed to start: {e}")
+    return _server
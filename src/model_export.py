@@ -0,0 +1,103 @@
+"""
+Model Export for Text Morph
+Prepares int8-quantized and ONNX versions of the local summarization model
+
+Usage:
+    python src/model_export.py --mode int8
+    python src/model_export.py --mode onnx --model sshleifer/distilbart-cnn-12-6
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from configure.config_manager import config
+from local_inference import artifact_path, import_ort_model, import_torch, quantize_int8
+
+
+def export_int8(model_name: str, model_dir: str) -> str:
+    """
+    Quantize the model's Linear layers to int8 and save the whole module.
+
+    Args:
+        model_name: Hugging Face model id
+        model_dir: Output directory
+
+    Returns:
+        Path of the saved model
+    """
+    torch, transformers = import_torch()
+    model = transformers.AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    quantized = quantize_int8(torch, model)
+    path = artifact_path(model_name, "int8", model_dir)
+    torch.save(quantized, path)
+    return path
+
+
+def export_onnx(model_name: str, model_dir: str) -> str:
+    """
+    Export the model to ONNX Runtime graphs with a decoder-with-past graph
+    so decoding reuses cached encoder outputs and key/values.
+
+    Args:
+        model_name: Hugging Face model id
+        model_dir: Output directory
+
+    Returns:
+        Directory holding the exported graphs and tokenizer
+    """
+    _, transformers = import_torch()
+    ort_model = import_ort_model()
+    path = artifact_path(model_name, "onnx", model_dir)
+    model = ort_model.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(path)
+    transformers.AutoTokenizer.from_pretrained(model_name).save_pretrained(path)
+    return path
+
+
+def prepare(model_name: str, mode: str, model_dir: str) -> str:
+    """
+    Write the artifact the local engine loads for a mode.
+
+    Args:
+        model_name: Hugging Face model id
+        mode: 'int8' or 'onnx'
+        model_dir: Output directory
+
+    Returns:
+        Path of the artifact
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    if mode == "int8":
+        return export_int8(model_name, model_dir)
+    return export_onnx(model_name, model_dir)
+
+
+def main(argv=None) -> int:
+    local_config = config.get('summarization.abstractive.local', {})
+    parser = argparse.ArgumentParser(description="Prepare int8/ONNX versions of the local summarization model")
+    parser.add_argument("--mode", choices=["int8", "onnx"], required=True, help="Model mode to prepare")
+    parser.add_argument("--model", default=local_config.get('model', 'facebook/bart-large-cnn'),
+                        help="Hugging Face model id (default: summarization.abstractive.local.model)")
+    parser.add_argument("--output", default=local_config.get('model_dir', 'models'),
+                        help="Output directory (default: summarization.abstractive.local.model_dir)")
+    args = parser.parse_args(argv)
+
+    print(f"📦 Preparing {args.mode} model for {args.model}...")
+    try:
+        path = prepare(args.model, args.mode, args.output)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+    print(f"✅ Saved to {path}")
+    print(f"   Set summarization.abstractive.local.mode: {args.mode} in config.yaml to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,19 @@
+import json
 import os 
 import requests 
 from dotenv import load_dotenv
+from configure.config_manager import config, get_timeout
+from http_client import get_transport
+from async_http_client import get_async_transport
+from exceptions import GROQAPIError
+from retry import RetryPolicy, classify_exception, format_api_error, raise_for_response
+from variation_pool import VariationPool
+
+
+def _is_numbered(line):
+    """Whether a line starts a numbered variation (1., 2., etc.)."""
+    return any(line.startswith(f"{i}.") for i in range(1, 10))
+
 
 class Paraphraser:
     """
@@ -10,7 +23,8 @@ class Paraphraser:
     - llama-3.1-70b-versatile (high quality)
     """
 
-    def __init__(self, model_name="llama-3.1-8b-instant"):
+    def __init__(self, model_name="llama-3.1-8b-instant", transport=None, async_transport=None, rate_limiter=None,
+                 retry_policy=None):
         load_dotenv()
         self.api_key = os.getenv("GROQ_API_KEY")
 
@@ -23,6 +37,29 @@ class Paraphraser:
             "Content-Type": "application/json"
         }
         self.model_name = model_name
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport or get_async_transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_config('groq')
+        self.pool = VariationPool.from_config(self.generate_variations) \
+            if config.get('paraphrasing.pool.enabled', True) else None
+        self.reload_settings()
+
+    def reload_settings(self):
+        """Read the timeout and rewrite sampling parameters from config.yaml (again, after a reload)."""
+        self.timeout = get_timeout('groq')
+        self.rewrite_temperature = config.get_float('paraphrasing.segmented.temperature', 0.7)
+        self.rewrite_max_tokens = config.get_int('paraphrasing.segmented.max_output_tokens', 800)
+
+    def get_parameters(self):
+        """
+        Get the sampling parameters sent to the chat-completions endpoint.
+        """
+        return {
+            "model": self.model_name,
+            "temperature": 0.9,
+            "max_tokens": 1000
+        }
 
     def paraphrase(self, text, num_return_sequences=3):
         """
@@ -31,49 +68,324 @@ class Paraphraser:
         if not text.strip():
             return ["⚠️ Please provide valid text."]
 
+        try:
+            return self.generate(text, num_return_sequences)
+        except Exception as e:
+            return [format_api_error(e)]
+
+    def generate(self, text, num_return_sequences=3):
+        """
+        Generate paraphrased versions, retrying transient failures.
+
+        Raises:
+            TextMorphError subclasses (RateLimitError, APITimeoutError,
+            NetworkError, GROQAPIError, ...) once retries are exhausted
+        """
+        payload = self._build_payload(text, num_return_sequences)
+        before = (lambda: self.rate_limiter.acquire('groq')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post(payload, num_return_sequences, timeout),
+            before_attempt=before, timeout=self.timeout,
+        )
+
+    def _post(self, payload, num_return_sequences, timeout):
+        """Send one request and return the parsed variations or raise a typed error."""
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'groq', timeout) from e
+        raise_for_response(response, 'groq', self.model_name)
+        return self._parse_response(response, num_return_sequences)
+
+    async def paraphrase_async(self, text, num_return_sequences=3):
+        """
+        Generate paraphrased versions of input text without blocking the event loop.
+
+        Cancelling the awaiting task aborts the upstream request.
+        """
+        if not text.strip():
+            return ["⚠️ Please provide valid text."]
+
+        try:
+            return await self.generate_async(text, num_return_sequences)
+        except Exception as e:
+            return [format_api_error(e)]
+
+    async def generate_async(self, text, num_return_sequences=3):
+        """Async counterpart of generate()."""
+        payload = self._build_payload(text, num_return_sequences)
+        before = (lambda: self.rate_limiter.acquire_async('groq')) if self.rate_limiter else None
+        return await self.retry_policy.call_async(
+            lambda timeout: self._post_async(payload, num_return_sequences, timeout),
+            before_attempt=before, timeout=self.timeout,
+        )
+
+    async def _post_async(self, payload, num_return_sequences, timeout):
+        try:
+            response = await self.async_transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except Exception as e:
+            raise classify_exception(e, 'groq', timeout) from e
+        raise_for_response(response, 'groq', self.model_name)
+        return self._parse_response(response, num_return_sequences)
+
+    # -------- Variation pool --------
+    def paraphrase_pooled(self, text, num_return_sequences=3):
+        """
+        Serve variations not shown before for this text, from the variation pool.
+
+        Repeat requests ("regenerate") are answered from the pool without an
+        API call; the pool refills in the background when it runs low.
+
+        Returns:
+            list: Same shape as paraphrase() (header line followed by numbered variations)
+
+        Raises:
+            TextMorphError subclasses if the pool had to be filled and the call failed
+        """
+        if self.pool is None:
+            return self.generate(text, num_return_sequences)
+        return self._format_pooled(self.pool.take(text, num_return_sequences))
+
+    async def paraphrase_pooled_async(self, text, num_return_sequences=3, generate=None):
+        """
+        Async counterpart of paraphrase_pooled().
+
+        A pool hit only takes a lock; on a miss a full batch is generated on
+        the async transport and added to the pool.
+
+        Args:
+            generate: Coroutine function taking (text, count) used on a miss
+                (default: generate_variations_async)
+        """
+        if self.pool is None:
+            return await self.generate_async(text, num_return_sequences)
+        pooled = self.take_pooled(text, num_return_sequences)
+        if pooled:
+            return pooled
+        generate = generate or self.generate_variations_async
+        variations = await generate(text, max(self.pool.batch_size, num_return_sequences))
+        return self._format_pooled(self.pool.serve_fetched(text, variations, num_return_sequences))
+
+    def take_pooled(self, text, num_return_sequences=3):
+        """
+        Serve unseen variations only if the pool already holds enough, without an API call.
+
+        Returns:
+            list: Same shape as paraphrase(), or None on a pool miss
+        """
+        if self.pool is None:
+            return None
+        return self._format_pooled(self.pool.take_ready(text, num_return_sequences)) or None
+
+    def add_to_pool(self, text, variations):
+        """
+        Record variations generated outside the pool (e.g. streamed) as shown,
+        so the pool never serves them again and fills up for the next request.
+
+        Args:
+            text: Input text
+            variations: List as returned by paraphrase() (header line and numbered variations)
+        """
+        if self.pool is not None:
+            self.pool.add_served(text, [line for line in variations if _is_numbered(line)])
+
+    @staticmethod
+    def _format_pooled(variations):
+        if not variations:
+            return []
+        return ["Here are three unique paraphrased versions of the text:"] + \
+            [f"{i}. {variation}" for i, variation in enumerate(variations, 1)]
+
+    def generate_variations(self, text, count):
+        """Generate `count` variations without the header line (used to fill the pool)."""
+        return [line for line in self.generate(text, count) if _is_numbered(line)]
+
+    async def generate_variations_async(self, text, count):
+        """Async counterpart of generate_variations()."""
+        return [line for line in await self.generate_async(text, count) if _is_numbered(line)]
+
+    # -------- Single rewrite (segmented documents) --------
+    def get_rewrite_parameters(self):
+        """
+        Get the sampling parameters for rewriting one document segment.
+        """
+        return {
+            "model": self.model_name,
+            "temperature": self.rewrite_temperature,
+            "max_tokens": self.rewrite_max_tokens,
+        }
+
+    def rewrite(self, text):
+        """
+        Paraphrase a passage once, returning only the rewritten text.
+
+        Raises:
+            TextMorphError subclasses once retries are exhausted
+        """
+        payload = {
+            **self.get_rewrite_parameters(),
+            "messages": [
+                {"role": "system", "content": "You are a helpful AI that paraphrases text naturally and clearly."},
+                {"role": "user", "content": (
+                    "Paraphrase the following passage in natural English, keeping its meaning and length. "
+                    f"Reply with the paraphrased passage only:\n\n{text}"
+                )}
+            ]
+        }
+        before = (lambda: self.rate_limiter.acquire('groq')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post_rewrite(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _post_rewrite(self, payload, timeout):
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'groq', timeout) from e
+        raise_for_response(response, 'groq', self.model_name)
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    # -------- Streaming --------
+    def open_stream(self, text, num_return_sequences=3):
+        """
+        Start a streamed completion (`stream: true`), retrying until the response headers arrive.
+
+        Returns:
+            requests.Response with an unread server-sent event body
+
+        Raises:
+            TextMorphError subclasses once retries are exhausted
+        """
+        payload = {**self._build_payload(text, num_return_sequences), "stream": True}
+        before = (lambda: self.rate_limiter.acquire('groq')) if self.rate_limiter else None
+        return self.retry_policy.call(
+            lambda timeout: self._post_stream(payload, timeout), before_attempt=before, timeout=self.timeout
+        )
+
+    def _post_stream(self, payload, timeout):
+        try:
+            response = self.transport.post(self.api_url, headers=self.headers, json=payload,
+                                           timeout=timeout, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'groq', timeout) from e
+        if response.status_code != 200:
+            response.content  # read the error body before closing
+            response.close()
+        raise_for_response(response, 'groq', self.model_name)
+        return response
+
+    def iter_deltas(self, response):
+        """
+        Parse server-sent events from a streamed completion as they arrive.
+
+        Args:
+            response: Response returned by open_stream()
+
+        Yields:
+            str: Content deltas in order
+
+        Raises:
+            GROQAPIError: If the stream reports an error
+            NetworkError / APITimeoutError: If the connection drops mid-stream
+        """
+        try:
+            for raw in response.iter_lines(chunk_size=None):
+                line = raw.decode("utf-8").strip() if raw else ""
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                event = json.loads(data)
+                if "error" in event:
+                    raise GROQAPIError(message=str(event["error"].get("message", event["error"])))
+                for choice in event.get("choices", []):
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+        except requests.exceptions.RequestException as e:
+            raise classify_exception(e, 'groq', self.timeout) from e
+        finally:
+            response.close()
+
+    def paraphrase_stream(self, text, num_return_sequences=3, response=None):
+        """
+        Stream paraphrased variations as they are generated.
+
+        Args:
+            text (str): Input text
+            num_return_sequences (int): Number of variations
+            response: Already opened stream (see open_stream()); opened here if omitted
+
+        Yields:
+            dict: {"type": "delta", "text"} for every content delta,
+            {"type": "variation", "index", "text"} as each numbered variation completes,
+            and finally {"type": "final", "variations"} with the same list paraphrase() returns
+        """
+        if response is None:
+            response = self.open_stream(text, num_return_sequences)
+
+        content, pending, emitted = [], "", 0
+
+        def completed_variation(line):
+            nonlocal emitted
+            line = line.strip()
+            if _is_numbered(line) and emitted < num_return_sequences:
+                emitted += 1
+                return {"type": "variation", "index": emitted, "text": line}
+            return None
+
+        for delta in self.iter_deltas(response):
+            content.append(delta)
+            yield {"type": "delta", "text": delta}
+            pending += delta
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                event = completed_variation(line)
+                if event:
+                    yield event
+        event = completed_variation(pending)
+        if event:
+            yield event
+        yield {"type": "final", "variations": self._extract_variations("".join(content), num_return_sequences)}
+
+    def _build_payload(self, text, num_return_sequences):
         prompt = (
             f"Paraphrase the following text in natural English. "
             f"Provide {num_return_sequences} unique variations as numbered points (1., 2., etc.):\n\n{text}"
         )
 
-        payload = {
-            "model": self.model_name,
+        return {
+            **self.get_parameters(),
             "messages": [
                 {"role": "system", "content": "You are a helpful AI that paraphrases text naturally and clearly."},
                 {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.9,
-            "max_tokens": 1000
+            ]
         }
 
-        try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-
-            if response.status_code == 200:
-                data = response.json()
-                text_response = data["choices"][0]["message"]["content"]
-                
-                # Parse numbered points
-                lines = []
-                for line in text_response.split("\n"):
-                    line = line.strip()
-                    
-                    # Keep lines that start with numbers (1., 2., etc.)
-                    if line and any(line.startswith(f"{i}.") for i in range(1, 10)):
-                        lines.append(line)
-                
-                # If numbered format not found, fallback to all non-empty lines
-                if not lines:
-                    lines = [f"{i+1}. {line.strip()}" for i, line in enumerate(text_response.split("\n")) 
-                            if line.strip() and not any(skip in line.lower() for skip in ["here are", "paraphrased"])]
-                
-                # Add header and return
-                result_lines = lines[:num_return_sequences]
-                if result_lines:
-                    return ["Here are three unique paraphrased versions of the text:"] + result_lines
-                return result_lines
-            else:
-                return [f"❌ API Error {response.status_code}: {response.text}"]
+    def _parse_response(self, response, num_return_sequences):
+        """Extract numbered variations from a successful chat-completions response."""
+        data = response.json()
+        return self._extract_variations(data["choices"][0]["message"]["content"], num_return_sequences)
 
-        except Exception as e:
-            return [f"❌ Error: {str(e)}"]
\ No newline at end of file
+    def _extract_variations(self, text_response, num_return_sequences):
+        """Split completion text into numbered variations (with the header line paraphrase() returns)."""
+        # Parse numbered points
+        lines = []
+        for line in text_response.split("\n"):
+            line = line.strip()
+            
+            # Keep lines that start with numbers (1., 2., etc.)
+            if line and _is_numbered(line):
+                lines.append(line)
+        
+        # If numbered format not found, fallback to all non-empty lines
+        if not lines:
+            lines = [f"{i+1}. {line.strip()}" for i, line in enumerate(text_response.split("\n")) 
+                    if line.strip() and not any(skip in line.lower() for skip in ["here are", "paraphrased"])]
+        
+        # Add header and return
+        result_lines = lines[:num_return_sequences]
+        if result_lines:
+            return ["Here are three unique paraphrased versions of the text:"] + result_lines
+        return result_lines
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Progressive Summaries for Text Morph
+Serves an instant local draft while the abstractive summary is generated in the background
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ProgressiveSummary:
+    """Handle for a summary that starts as a local draft and is upgraded later.
+
+    `draft` is available as soon as the handle is returned. The final
+    (abstractive) result arrives on `future`; until then `current` returns
+    the draft. Callbacks registered with `on_update` receive the draft
+    straight away and the final result when it is ready. If the final
+    summary fails, `current` keeps returning the draft.
+    """
+
+    def __init__(self, draft: Dict[str, Any], future: Future):
+        """
+        Initialize the handle.
+
+        Args:
+            draft: Detail dict of the local draft ({"summary", "method", "backend", ...})
+            future: Future resolving to the final detail dict
+        """
+        self.draft = {**draft, "stage": "draft"}
+        self.future = future
+        self._callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        future.add_done_callback(self._notify)
+
+    def on_update(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback for the draft and the final result.
+
+        The callback is called with the draft immediately, then once more
+        with the final result from the worker thread that produced it (or
+        immediately, if it is already done).
+
+        Args:
+            callback: Function taking a detail dict with a "stage" key ('draft' or 'final')
+        """
+        callback(self.draft)
+        with self._lock:
+            if not self.future.done():
+                self._callbacks.append(callback)
+                return
+        callback(self.result())
+
+    def _notify(self, _future: Future) -> None:
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        if not callbacks:
+            return
+        final = self.result()
+        for callback in callbacks:
+            try:
+                callback(final)
+            except Exception as e:
+                print(f"⚠️ Warning: Progressive summary callback failed: {e}")
+
+    def done(self) -> bool:
+        """Whether the final result has arrived."""
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for the final result.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            Final detail dict with "stage": "final"; "summary" holds an error message if it failed
+
+        Raises:
+            concurrent.futures.TimeoutError: If the result is not ready within `timeout`
+        """
+        try:
+            final = self.future.result(timeout)
+        except Exception as e:
+            if not self.future.done():
+                raise
+            final = {**self.draft, "summary": f"❌ Error: {e}"}
+        return {**final, "stage": "final"}
+
+    @property
+    def current(self) -> Dict[str, Any]:
+        """The best result available right now: the final one if it succeeded, else the draft."""
+        if self.future.done():
+            final = self.result()
+            if not final["summary"].startswith(("❌", "⚠️")):
+                return final
+        return self.draft
+
+    def cancel(self) -> bool:
+        """Cancel the final summary if it has not started yet."""
+        return self.future.cancel()
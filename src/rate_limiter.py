@@ -0,0 +1,256 @@
+"""
+Rate Limiter for Text Morph
+Client-side multi-window token buckets per upstream service
+"""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from configure.config_manager import config
+from exceptions import RateLimitError
+
+
+class TokenBucket:
+    """Token bucket that allows a debt, so waiting callers are served in arrival order."""
+
+    def __init__(self, capacity: int, period: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            capacity: Maximum requests per period (also the burst size)
+            period: Window length in seconds
+        """
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until one more token would be available (0 if available now)."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-service limiter enforcing several windows (e.g. per minute and per hour) at once.
+
+    `acquire()` reserves a slot immediately and sleeps until it becomes valid,
+    so queued callers proceed in FIFO order. `try_acquire()` never waits and
+    raises RateLimitError with the time until the next free slot.
+    """
+
+    def __init__(self, limits: Dict[str, List[Tuple[int, float]]], max_wait: Optional[float] = None,
+                 blocking: bool = True):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Mapping of service name to (max_requests, period_seconds) windows
+            max_wait: Longest a blocking caller may queue before RateLimitError
+            blocking: If False, acquire() behaves like try_acquire()
+        """
+        self.max_wait = max_wait
+        self.blocking = blocking
+        self._lock = threading.Lock()
+        self._buckets = {
+            service: [TokenBucket(capacity, period) for capacity, period in windows]
+            for service, windows in limits.items()
+        }
+        self._stats = {
+            service: {"granted": 0, "rejected": 0, "waiting": 0, "total_wait": 0.0}
+            for service in limits
+        }
+
+    def _reserve(self, service: str, max_wait: Optional[float]) -> float:
+        """
+        Reserve one request slot for the service.
+
+        Returns:
+            Seconds the caller must wait before sending
+
+        Raises:
+            RateLimitError: If the wait would exceed `max_wait`
+        """
+        buckets = self._buckets.get(service)
+        if not buckets:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            for bucket in buckets:
+                bucket.refill(now)
+            wait = max(bucket.wait_time() for bucket in buckets)
+            if max_wait is not None and wait > max_wait:
+                self._stats[service]["rejected"] += 1
+                raise RateLimitError(service, retry_after=math.ceil(wait), client_side=True)
+            for bucket in buckets:
+                bucket.tokens -= 1
+            stats = self._stats[service]
+            stats["granted"] += 1
+            stats["total_wait"] += wait
+            return wait
+
+    def _release(self, service: str) -> None:
+        """Give back a reserved slot that was never used."""
+        with self._lock:
+            for bucket in self._buckets.get(service, []):
+                bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+            self._stats[service]["granted"] -= 1
+
+    def _default_timeout(self) -> Optional[float]:
+        return self.max_wait if self.blocking else 0
+
+    def acquire(self, service: str, timeout: Optional[float] = None) -> float:
+        """
+        Block until a request slot is available.
+
+        Args:
+            service: Upstream service name ('huggingface' or 'groq')
+            timeout: Longest to wait (defaults to max_wait, or 0 in non-blocking mode)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitError: If no slot frees up within the timeout
+        """
+        wait = self._reserve(service, self._default_timeout() if timeout is None else timeout)
+        if wait > 0:
+            self._stats[service]["waiting"] += 1
+            try:
+                time.sleep(wait)
+            finally:
+                self._stats[service]["waiting"] -= 1
+        return wait
+
+    async def acquire_async(self, service: str, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a request slot without blocking the event loop.
+
+        A cancelled waiter returns its reserved slot.
+
+        Args:
+            service: Upstream service name
+            timeout: Longest to wait (defaults to max_wait, or 0 in non-blocking mode)
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(service, self._default_timeout() if timeout is None else timeout)
+        if wait > 0:
+            self._stats[service]["waiting"] += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._release(service)
+                raise
+            finally:
+                self._stats[service]["waiting"] -= 1
+        return wait
+
+    def try_acquire(self, service: str) -> None:
+        """
+        Take a request slot only if one is free right now.
+
+        Args:
+            service: Upstream service name
+
+        Raises:
+            RateLimitError: With `retry_after` set to the seconds until the next free slot
+        """
+        self._reserve(service, 0)
+
+    def update_limits(self, limits: Dict[str, List[Tuple[int, float]]]) -> None:
+        """
+        Replace the configured windows, keeping current usage where a window still exists.
+        Services missing from `limits` are no longer limited.
+
+        Args:
+            limits: Mapping of service name to (max_requests, period_seconds) windows
+        """
+        with self._lock:
+            for service in list(self._buckets):
+                if service not in limits:
+                    del self._buckets[service]
+            for service, windows in limits.items():
+                old = {bucket.period: bucket for bucket in self._buckets.get(service, [])}
+                buckets = []
+                for capacity, period in windows:
+                    bucket = TokenBucket(capacity, period)
+                    previous = old.get(period)
+                    if previous is not None:
+                        bucket.tokens = min(capacity, previous.tokens)
+                        bucket.updated = previous.updated
+                    buckets.append(bucket)
+                self._buckets[service] = buckets
+                self._stats.setdefault(service, {"granted": 0, "rejected": 0, "waiting": 0, "total_wait": 0.0})
+
+    def get_state(self) -> Dict[str, Dict]:
+        """
+        Get limiter state for monitoring.
+
+        Returns:
+            Per-service windows with available tokens, plus grant/reject/wait counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = {}
+            for service, buckets in self._buckets.items():
+                windows = []
+                for bucket in buckets:
+                    bucket.refill(now)
+                    windows.append({
+                        "limit": bucket.capacity,
+                        "period": bucket.period,
+                        "available": round(bucket.tokens, 2),
+                    })
+                stats = self._stats[service]
+                state[service] = {
+                    "windows": windows,
+                    "granted": stats["granted"],
+                    "rejected": stats["rejected"],
+                    "waiting": stats["waiting"],
+                    "avg_wait": round(stats["total_wait"] / stats["granted"], 3) if stats["granted"] else 0.0,
+                }
+            return state
+
+    @staticmethod
+    def limits_from_config(source=config) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Read per-service windows from `performance.rate_limit` in config.yaml.
+
+        Args:
+            source: The config manager, or a reloaded ConfigSnapshot not yet applied
+        """
+        rate_config = source.get('performance.rate_limit', {})
+        if not rate_config.get('enabled', True):
+            return {}
+
+        limits = {}
+        for service in ('huggingface', 'groq'):
+            service_config = {**rate_config, **rate_config.get('services', {}).get(service, {})}
+            windows = []
+            if service_config.get('max_requests_per_minute'):
+                windows.append((service_config['max_requests_per_minute'], 60.0))
+            if service_config.get('max_requests_per_hour'):
+                windows.append((service_config['max_requests_per_hour'], 3600.0))
+            if windows:
+                limits[service] = windows
+        return limits
+
+    @classmethod
+    def from_config(cls) -> "RateLimiter":
+        """Build a limiter from `performance.rate_limit` in config.yaml."""
+        return cls(
+            cls.limits_from_config(),
+            max_wait=config.get('performance.rate_limit.max_wait', 60),
+            blocking=config.get('performance.rate_limit.mode', 'wait') != 'try',
+        )
@@ -0,0 +1,269 @@
+"""
+Persistent Result Store for Text Morph
+Content-addressed SQLite (WAL) store shared by every worker process on a host
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from configure.config_manager import config
+from exceptions import FileOperationError
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL,
+    size    INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_expires ON results (expires);
+CREATE INDEX IF NOT EXISTS idx_results_created ON results (created);
+"""
+
+
+# PRAGMA auto_vacuum value for INCREMENTAL (0 = NONE, 1 = FULL)
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class ResultStore:
+    """SQLite-backed result store with batched writes, TTL expiry and a size cap.
+
+    Readers never block each other or the writer (WAL mode). Writes are buffered
+    in memory and committed in one transaction per batch by a background thread.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 100000,
+                 max_bytes: int = 104857600, batch_size: int = 32,
+                 flush_interval: float = 1.0, maintenance_interval: float = 300):
+        """
+        Initialize the result store.
+
+        Args:
+            path: SQLite database file (created if missing)
+            ttl: Time to live for stored results in seconds
+            max_entries: Maximum number of rows kept after maintenance
+            max_bytes: Maximum total size of stored values after maintenance
+            batch_size: Pending writes that trigger an immediate flush
+            flush_interval: Maximum seconds a write stays buffered
+            maintenance_interval: Seconds between expiry/size-cap passes
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maintenance_interval = maintenance_interval
+
+        self._local = threading.local()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._closed = threading.Event()
+        self._last_maintenance = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.purged = 0
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connection()
+            conn.executescript(_SCHEMA)
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL:
+                # A store created without incremental auto_vacuum (e.g. by an earlier
+                # version) only switches after a one-time VACUUM
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+        except (OSError, sqlite3.Error) as e:
+            raise FileOperationError(f"Failed to open result store: {e}", filepath=str(self.path))
+
+        self._writer = threading.Thread(target=self._flush_loop, name="textmorph-result-store", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are not shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            # Must come first: switching to WAL writes the database header, after
+            # which auto_vacuum can no longer be set on a new database
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Content-addressed cache key
+
+        Returns:
+            Stored value, or None if missing or expired
+        """
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return pending[0]
+
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM results WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Queue a result for the next batched write.
+
+        Args:
+            key: Content-addressed cache key
+            value: Result to store
+        """
+        now = time.time()
+        with self._pending_lock:
+            self._pending[key] = (value, now)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._flush_event.set()
+
+    def flush(self) -> int:
+        """
+        Write all pending results in a single transaction.
+
+        Returns:
+            Number of rows written
+        """
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        rows = [
+            (key, value, len(value.encode("utf-8")), created, created + self.ttl)
+            for key, (value, created) in batch.items()
+        ]
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value, size, created, expires) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Keep results for the next attempt unless newer values arrived meanwhile
+            with self._pending_lock:
+                for key, entry in batch.items():
+                    self._pending.setdefault(key, entry)
+            return 0
+
+        self.writes += len(rows)
+        return len(rows)
+
+    def purge(self) -> int:
+        """
+        Delete expired rows, enforce the entry and byte caps, and reclaim free pages.
+
+        Returns:
+            Number of rows deleted
+        """
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            deleted = conn.execute("DELETE FROM results WHERE expires <= ?", (time.time(),)).rowcount
+            deleted += conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            # Oldest rows beyond the byte budget (newest rows are kept first)
+            deleted += conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM "
+                "(SELECT key, SUM(size) OVER (ORDER BY created DESC, key) AS running FROM results) "
+                "WHERE running > ?)",
+                (self.max_bytes,),
+            ).rowcount
+            conn.execute("COMMIT")
+            if deleted:
+                # execute() steps the pragma once, freeing a single page;
+                # executescript() runs it to completion
+                conn.executescript("PRAGMA incremental_vacuum;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return 0
+
+        self.purged += deleted
+        return deleted
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+            if time.monotonic() - self._last_maintenance >= self.maintenance_interval:
+                self._last_maintenance = time.monotonic()
+                self.purge()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background writer."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flush_event.set()
+        self._writer.join(timeout=5)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store counters.
+
+        Returns:
+            Dictionary with hit/miss/write counters and pending writes
+        """
+        return {
+            "path": str(self.path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "purged": self.purged,
+            "pending": len(self._pending),
+        }
+
+    @classmethod
+    def from_config(cls) -> "ResultStore":
+        """Build a store from the `result_store` section of config.yaml."""
+        store_config = config.get('result_store', {})
+        return cls(
+            path=store_config.get('path', 'data/results.db'),
+            ttl=store_config.get('ttl', 86400),
+            max_entries=store_config.get('max_entries', 100000),
+            max_bytes=store_config.get('max_bytes', 104857600),
+            batch_size=store_config.get('batch_size', 32),
+            flush_interval=store_config.get('flush_interval', 1.0),
+            maintenance_interval=store_config.get('maintenance_interval', 300),
+        )
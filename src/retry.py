@@ -0,0 +1,351 @@
+"""
+Retry Policy for Text Morph
+Classifies upstream failures into typed exceptions and retries them with jittered backoff
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import requests
+from configure.config_manager import config
+from exceptions import (
+    APIError,
+    APIKeyError,
+    APITimeoutError,
+    CircuitOpenError,
+    GROQAPIError,
+    HuggingFaceAPIError,
+    ModelLoadingError,
+    NetworkError,
+    RateLimitError,
+    TextMorphError,
+    format_error_for_ui,
+)
+
+
+_SERVICE_ERRORS = {
+    'huggingface': HuggingFaceAPIError,
+    'groq': GROQAPIError,
+}
+
+_SERVICE_NAMES = {
+    'huggingface': 'Hugging Face',
+    'groq': 'GROQ',
+}
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Parse a Retry-After header given in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0, int(float(value)))
+    except ValueError:
+        return None
+
+
+def raise_for_response(response, service: str, model_name: str = None) -> None:
+    """
+    Raise the typed exception matching an unsuccessful API response.
+
+    Args:
+        response: requests.Response or AsyncResponse
+        service: Service key ('huggingface' or 'groq')
+        model_name: Model the request was sent to
+
+    Raises:
+        APIKeyError: On 401/403
+        RateLimitError: On 429 (with Retry-After when present)
+        ModelLoadingError: On a Hugging Face 503 for a cold model
+        HuggingFaceAPIError / GROQAPIError: On any other non-200 status
+    """
+    status = response.status_code
+    if status == 200:
+        return
+
+    if status in (401, 403):
+        raise APIKeyError(_SERVICE_NAMES.get(service, service))
+
+    if status == 429:
+        raise RateLimitError(service, retry_after=_parse_retry_after(response.headers.get('Retry-After')))
+
+    if status == 503 and service == 'huggingface':
+        estimated_time = None
+        try:
+            body = response.json()
+            if isinstance(body, dict):
+                estimated_time = body.get('estimated_time')
+        except ValueError:
+            pass
+        raise ModelLoadingError(model_name or service, estimated_time=estimated_time)
+
+    error_class = _SERVICE_ERRORS.get(service, APIError)
+    raise error_class(status_code=status, response=response.text)
+
+
+def classify_exception(error: Exception, service: str, timeout: float = None) -> Exception:
+    """
+    Map a transport exception to the matching typed exception.
+
+    Args:
+        error: Exception raised by requests or aiohttp
+        service: Service key
+        timeout: Timeout that applied to the request
+
+    Returns:
+        APITimeoutError, NetworkError, or the original exception
+    """
+    if isinstance(error, (requests.exceptions.Timeout, asyncio.TimeoutError)):
+        return APITimeoutError(service, timeout)
+    if isinstance(error, (requests.exceptions.ConnectionError, ConnectionError)):
+        return NetworkError(f"Network error contacting {service}: {error}")
+    # aiohttp is optional at this layer; match its base class by name
+    if any(cls.__name__ == 'ClientError' for cls in type(error).__mro__):
+        return NetworkError(f"Network error contacting {service}: {error}")
+    return error
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient and worth retrying."""
+    if isinstance(error, (ModelLoadingError, RateLimitError, APITimeoutError, NetworkError)):
+        return True
+    if isinstance(error, APIError) and error.status_code is not None:
+        return error.status_code >= 500
+    return False
+
+
+def _server_hint(error: Exception) -> Optional[float]:
+    """Delay the server asked for (Retry-After or HF estimated_time), if any."""
+    if isinstance(error, RateLimitError) and error.retry_after is not None:
+        return float(error.retry_after)
+    if isinstance(error, ModelLoadingError) and error.estimated_time is not None:
+        return float(error.estimated_time)
+    return None
+
+
+class RetryPolicy:
+    """Retries transient failures with decorrelated-jitter backoff under an overall deadline.
+
+    Every call records per-attempt timings so slow tails can be attributed to
+    retries, cold-model waits or slow single attempts.
+    """
+
+    def __init__(self, service: str, max_retries: int = 3, base_delay: float = 2.0,
+                 max_delay: float = 30.0, deadline: float = 120.0, history_size: int = 100):
+        """
+        Initialize the retry policy.
+
+        Args:
+            service: Service key used for reporting
+            max_retries: Retries after the first attempt
+            base_delay: Minimum backoff delay in seconds
+            max_delay: Maximum jittered backoff delay in seconds
+            deadline: Overall time budget for a call including all retries
+            history_size: Number of recent calls kept for inspection
+        """
+        self.service = service
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def next_delay(self, previous: float, error: Exception) -> float:
+        """
+        Compute the next backoff delay.
+
+        Decorrelated jitter: uniform between base_delay and 3x the previous delay,
+        capped at max_delay. A server hint (Retry-After / estimated_time) is
+        used as a lower bound.
+        """
+        delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+        hint = _server_hint(error)
+        if hint is not None:
+            delay = max(delay, hint)
+        return delay
+
+    def _plan_retry(self, attempts: List[Dict], error: Exception, previous_delay: float,
+                    started: float) -> Optional[float]:
+        """Decide whether to retry; returns the delay or None to give up."""
+        if not is_retryable(error) or len(attempts) > self.max_retries:
+            return None
+        delay = self.next_delay(previous_delay, error)
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        attempts[-1]["delay"] = round(delay, 3)
+        return delay
+
+    def _attempt_timeout(self, timeout: float, started: float) -> float:
+        """
+        Per-attempt timeout, capped at the time left before the deadline.
+
+        Raises:
+            APITimeoutError: If the deadline has already passed (e.g. while rate limited)
+        """
+        remaining = self.deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            raise APITimeoutError(self.service, self.deadline)
+        return min(timeout, max(round(remaining, 2), 0.01))
+
+    def _record(self, attempts: List[Dict], started: float, outcome: str) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += len(attempts) - 1
+            if outcome != "success":
+                self.failures += 1
+            self.history.append({
+                "service": self.service,
+                "outcome": outcome,
+                "attempts": attempts,
+                "total": round(time.monotonic() - started, 3),
+            })
+
+    @staticmethod
+    def _attempt_record(number: int, started: float, error: Exception = None) -> Dict[str, Any]:
+        return {
+            "attempt": number,
+            "duration": round(time.monotonic() - started, 3),
+            "outcome": type(error).__name__ if error else "success",
+            "status": getattr(error, "status_code", None) if error else 200,
+        }
+
+    def call(self, fn: Callable[..., Any], before_attempt: Callable[[], Any] = None,
+             timeout: Optional[float] = None) -> Any:
+        """
+        Run `fn` with retries.
+
+        Args:
+            fn: Function performing one attempt; raises typed exceptions on failure.
+                Takes no arguments, or the attempt's timeout if `timeout` is given
+            before_attempt: Optional hook run before every attempt (e.g. rate limiting);
+                errors it raises are not retried
+            timeout: Per-request timeout; each attempt gets at most the time left
+                before the deadline, so the call never overruns it
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            The last error once retries or the deadline are exhausted
+        """
+        started = time.monotonic()
+        attempts = []
+        delay = self.base_delay
+        while True:
+            if before_attempt is not None:
+                before_attempt()
+            attempt_started = time.monotonic()
+            try:
+                result = fn() if timeout is None else fn(self._attempt_timeout(timeout, started))
+            except Exception as e:
+                attempts.append(self._attempt_record(len(attempts) + 1, attempt_started, e))
+                delay = self._plan_retry(attempts, e, delay, started)
+                if delay is None:
+                    self._record(attempts, started, type(e).__name__)
+                    raise
+                time.sleep(delay)
+                continue
+            attempts.append(self._attempt_record(len(attempts) + 1, attempt_started))
+            self._record(attempts, started, "success")
+            return result
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]],
+                         before_attempt: Callable[[], Awaitable[Any]] = None,
+                         timeout: Optional[float] = None) -> Any:
+        """
+        Await `fn()` with retries; async counterpart of call().
+
+        Args:
+            fn: Coroutine function performing one attempt (given the attempt's timeout if `timeout` is set)
+            before_attempt: Optional coroutine function awaited before every attempt
+            timeout: Per-request timeout, capped at the time left before the deadline
+
+        Returns:
+            Result of the first successful attempt
+        """
+        started = time.monotonic()
+        attempts = []
+        delay = self.base_delay
+        while True:
+            if before_attempt is not None:
+                await before_attempt()
+            attempt_started = time.monotonic()
+            try:
+                result = await (fn() if timeout is None else fn(self._attempt_timeout(timeout, started)))
+            except Exception as e:
+                attempts.append(self._attempt_record(len(attempts) + 1, attempt_started, e))
+                delay = self._plan_retry(attempts, e, delay, started)
+                if delay is None:
+                    self._record(attempts, started, type(e).__name__)
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            attempts.append(self._attempt_record(len(attempts) + 1, attempt_started))
+            self._record(attempts, started, "success")
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get retry counters and the most recent call with more than one attempt.
+
+        Returns:
+            Dictionary with call/retry/failure counts
+        """
+        with self._lock:
+            last_retried = next((call for call in reversed(self.history) if len(call["attempts"]) > 1), None)
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "last_retried_call": last_retried,
+            }
+
+    @classmethod
+    def from_config(cls, service: str, source=config) -> "RetryPolicy":
+        """
+        Build a policy from `api.<service>` in config.yaml.
+
+        Args:
+            service: 'huggingface' or 'groq'
+            source: The config manager, or a reloaded ConfigSnapshot not yet applied
+        """
+        return cls(
+            service,
+            max_retries=source.get_int(f'api.{service}.max_retries', 3),
+            base_delay=source.get_float(f'api.{service}.retry_delay', 2),
+            max_delay=source.get_float(f'api.{service}.max_retry_delay', 30),
+            deadline=source.get_float(f'api.{service}.deadline', 120),
+        )
+
+
+def format_api_error(error: Exception) -> str:
+    """
+    Turn an upstream error into the user-facing message from `error_messages` in config.yaml.
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        Message prefixed with ⚠️ (transient) or ❌ (failure)
+    """
+    if isinstance(error, ModelLoadingError):
+        return config.get_error_message('model_loading')
+    if isinstance(error, APITimeoutError):
+        return config.get_error_message('timeout')
+    if isinstance(error, (RateLimitError, CircuitOpenError)):
+        return f"⚠️ {error.message}"
+    if isinstance(error, APIKeyError):
+        return config.get_error_message('api_key_missing')
+    if isinstance(error, APIError) and error.status_code is not None:
+        return config.get_error_message('api_error', status_code=error.status_code, message=error.response)
+    if isinstance(error, TextMorphError):
+        return format_error_for_ui(error)
+    return config.get_error_message('general_error', error=str(error))
@@ -0,0 +1,165 @@
+"""
+Single-Flight Request Coalescing for Text Morph
+Lets concurrent identical requests share one upstream call
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running block and receive the leader's result or
+    exception. Once the call finishes the key is released, so later calls
+    run again (caching is a separate layer).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` once per key across concurrent callers.
+
+        Args:
+            key: Request identity (e.g. a cache key)
+            fn: Zero-argument function producing the result
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            Whatever exception the shared call raised
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with call, execution and coalesced counts
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight.
+
+    The shared call runs as its own task; each caller awaits it through
+    `asyncio.shield`, so one caller being cancelled does not cancel the others.
+    The shared task is cancelled only when every caller has gone away.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._waiters = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()` once per key across concurrent callers on the running loop.
+
+        Args:
+            key: Request identity (e.g. a cache key)
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            Result of the shared call
+        """
+        # Tasks belong to one loop; keep keys from different loops apart
+        flight_key = (id(asyncio.get_running_loop()), key)
+        self.calls += 1
+        task = self._tasks.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[flight_key] = task
+            self._waiters[flight_key] = 0
+            self.executions += 1
+            task.add_done_callback(lambda t: self._release(flight_key, t))
+        else:
+            self.coalesced += 1
+
+        self._waiters[flight_key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                self._waiters[flight_key] -= 1
+                if self._waiters[flight_key] <= 0:
+                    task.cancel()
+            raise
+
+    def _release(self, flight_key, task) -> None:
+        if self._tasks.get(flight_key) is task:
+            del self._tasks[flight_key]
+            self._waiters.pop(flight_key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with call, execution and coalesced counts
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
@@ -0,0 +1,284 @@
+"""
+Paraphrase Variation Pool for Text Morph
+Keeps unseen paraphrase variations per input so repeat requests are served instantly
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from cache import normalize_text
+from configure.config_manager import config
+from single_flight import SingleFlight
+
+
+_NUMBERING = re.compile(r"^\s*\d+[.)]\s*")
+
+
+def _strip_numbering(variation: str) -> str:
+    return _NUMBERING.sub("", variation).strip()
+
+
+class _PoolEntry:
+    __slots__ = ("available", "seen", "refilling", "touched")
+
+    def __init__(self):
+        self.available = deque()
+        self.seen = set()
+        self.refilling = False
+        self.touched = time.monotonic()
+
+
+class VariationPool:
+    """Per-input pool of paraphrase variations that have not been shown yet.
+
+    The first request for an input generates `batch_size` variations in one
+    call and serves the requested number (concurrent first requests share that
+    call); later requests are served from the pool without an API call. When fewer than `low_watermark` remain, a
+    background refill tops the pool up. Variations are de-duplicated against
+    everything already generated for that input, so users never see the same
+    wording twice.
+    """
+
+    def __init__(self, generate: Callable[[str, int], List[str]], batch_size: int = 9, low_watermark: int = 3,
+                 max_inputs: int = 256, ttl: float = 3600, max_workers: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            generate: Function taking (text, count) and returning variations; raises on failure
+            batch_size: Variations requested per API call
+            low_watermark: Remaining variations that trigger a background refill
+            max_inputs: Inputs tracked before the least recently used is dropped
+            ttl: Seconds an idle input's pool is kept
+            max_workers: Concurrent background refills
+        """
+        self.generate = generate
+        self.batch_size = batch_size
+        self.low_watermark = low_watermark
+        self.max_inputs = max_inputs
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="textmorph-pool")
+        self._fills = SingleFlight()
+        self.requests = 0
+        self.instant = 0
+        self.served = 0
+        self.api_calls = 0
+        self.generated = 0
+        self.refill_errors = 0
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> _PoolEntry:
+        """Get or create the entry for a key, evicting idle and least recently used ones. Caller holds the lock."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry.touched > self.ttl:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            entry = _PoolEntry()
+            self._entries[key] = entry
+            while len(self._entries) > self.max_inputs:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        entry.touched = now
+        return entry
+
+    def _add(self, entry: _PoolEntry, variations: List[str]) -> None:
+        """Add unseen variations to an entry. Caller holds the lock."""
+        for variation in variations:
+            variation = _strip_numbering(variation)
+            fingerprint = normalize_text(variation)
+            if variation and fingerprint not in entry.seen:
+                entry.seen.add(fingerprint)
+                entry.available.append(variation)
+
+    def _fetch(self, text: str, count: int) -> List[str]:
+        variations = self.generate(text, count)
+        with self._lock:
+            self.api_calls += 1
+            self.generated += len(variations)
+        return variations
+
+    def take(self, text: str, count: int) -> List[str]:
+        """
+        Get `count` variations of a text that have not been served before.
+
+        Args:
+            text: Input text
+            count: Number of variations
+
+        Returns:
+            Up to `count` distinct variations (fewer only if the model keeps repeating itself)
+
+        Raises:
+            Whatever `generate` raised when the pool had to be filled synchronously
+        """
+        key = self._key(text)
+        with self._lock:
+            self.requests += 1
+            entry = self._entry(key)
+            enough = len(entry.available) >= count
+
+        fetched = False
+        if not enough:
+            fetched = self._fill(key, entry, text, count)
+        else:
+            with self._lock:
+                self.instant += 1
+
+        with self._lock:
+            served = self._serve(key, entry, text, count)
+        if len(served) < count and not fetched:
+            # Concurrent requests for the same text took what this one was counting on
+            self._fill(key, entry, text, count - len(served))
+            with self._lock:
+                served += self._serve(key, entry, text, count - len(served))
+        return served
+
+    def _fill(self, key: str, entry: _PoolEntry, text: str, count: int) -> bool:
+        """
+        Fill an entry synchronously; concurrent requests for a text share one fetch.
+
+        Returns:
+            Whether this caller made the fetch (False if it waited on another's)
+        """
+        fetched_here = []
+
+        def fill():
+            fetched_here.append(True)
+            fetched = self._fetch(text, max(self.batch_size, count))
+            with self._lock:
+                self._add(entry, fetched)
+
+        self._fills.do(key, fill)
+        return bool(fetched_here)
+
+    def take_ready(self, text: str, count: int) -> List[str]:
+        """
+        Get `count` unseen variations only if they are already pooled.
+
+        Unlike take(), this never calls the API; on a miss the caller
+        generates the variations itself (e.g. streaming them) and reports
+        them with add_served().
+
+        Args:
+            text: Input text
+            count: Number of variations
+
+        Returns:
+            `count` variations, or an empty list if the pool cannot serve them now
+        """
+        key = self._key(text)
+        with self._lock:
+            self.requests += 1
+            entry = self._entry(key)
+            if len(entry.available) < count:
+                return []
+            self.instant += 1
+            return self._serve(key, entry, text, count)
+
+    def serve_fetched(self, text: str, variations: List[str], count: int) -> List[str]:
+        """
+        Add variations the caller generated after a take_ready() miss and serve `count` of them.
+
+        For callers that cannot block on take()'s synchronous fetch (e.g. an
+        async request generating on the event loop).
+
+        Args:
+            text: Input text
+            variations: Newly generated variations
+            count: Number of variations to serve
+
+        Returns:
+            Up to `count` distinct variations
+        """
+        key = self._key(text)
+        with self._lock:
+            self.api_calls += 1
+            self.generated += len(variations)
+            entry = self._entry(key)
+            self._add(entry, variations)
+            return self._serve(key, entry, text, count)
+
+    def add_served(self, text: str, variations: List[str]) -> None:
+        """
+        Record variations shown through another path so they are never served again,
+        and start filling the pool for the next request.
+
+        Args:
+            text: Input text
+            variations: Variations already shown to the user
+        """
+        key = self._key(text)
+        with self._lock:
+            entry = self._entry(key)
+            for variation in variations:
+                entry.seen.add(normalize_text(_strip_numbering(variation)))
+            self.served += len(variations)
+            self._schedule_refill(key, entry, text, 0)
+
+    def _serve(self, key: str, entry: _PoolEntry, text: str, count: int) -> List[str]:
+        """Pop up to `count` variations and refill if the pool runs low. Caller holds the lock."""
+        served = [entry.available.popleft() for _ in range(min(count, len(entry.available)))]
+        self.served += len(served)
+        self._schedule_refill(key, entry, text, count)
+        return served
+
+    def _schedule_refill(self, key: str, entry: _PoolEntry, text: str, count: int) -> None:
+        """Start a background refill below the low watermark. Caller holds the lock."""
+        if len(entry.available) < max(self.low_watermark, count) and not entry.refilling:
+            entry.refilling = True
+            self._executor.submit(self._refill, key, entry, text)
+
+    def _refill(self, key: str, entry: _PoolEntry, text: str) -> None:
+        try:
+            fetched = self._fetch(text, self.batch_size)
+            with self._lock:
+                self._add(entry, fetched)
+        except Exception:
+            with self._lock:
+                self.refill_errors += 1
+        finally:
+            with self._lock:
+                entry.refilling = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with request, instant-hit, API call and variation counts
+        """
+        with self._lock:
+            return {
+                "inputs": len(self._entries),
+                "requests": self.requests,
+                "instant": self.instant,
+                "served": self.served,
+                "api_calls": self.api_calls,
+                "generated": self.generated,
+                "variations_per_call": round(self.served / self.api_calls, 2) if self.api_calls else 0.0,
+                "refill_errors": self.refill_errors,
+            }
+
+    @classmethod
+    def from_config(cls, generate: Callable[[str, int], List[str]]) -> "VariationPool":
+        """Build a pool from `paraphrasing.pool` in config.yaml."""
+        pool_config = config.get('paraphrasing.pool', {})
+        return cls(
+            generate,
+            batch_size=pool_config.get('batch_size', 9),
+            low_watermark=pool_config.get('low_watermark', 3),
+            max_inputs=pool_config.get('max_inputs', 256),
+            ttl=pool_config.get('ttl', 3600),
+        )
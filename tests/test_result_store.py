@@ -0,0 +1,62 @@
+"""
+Tests for the persistent result store
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from result_store import ResultStore
+
+
+def test_new_store_uses_incremental_auto_vacuum(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    try:
+        conn = store._connection()
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        store.close()
+
+
+def test_existing_store_is_converted_to_incremental_auto_vacuum(tmp_path):
+    path = tmp_path / "results.db"
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    # The order used before: WAL first, so auto_vacuum stayed NONE
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute(
+        "CREATE TABLE results (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+        "created REAL NOT NULL, expires REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO results VALUES ('key', 'value', 5, 0, ?)", (time.time() + 3600,))
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    conn.close()
+
+    store = ResultStore(str(path))
+    try:
+        assert store._connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert store.get("key") == "value"
+    finally:
+        store.close()
+
+
+def test_purge_returns_free_pages(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"), ttl=0.001)
+    try:
+        for i in range(500):
+            store.put(f"key{i}", "x" * 2000)
+        store.flush()
+        time.sleep(0.01)
+
+        # The background writer may have purged already; either way the pages are returned
+        store.purge()
+        conn = store._connection()
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    finally:
+        store.close()